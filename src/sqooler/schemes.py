@@ -4,9 +4,10 @@ There is no obvious need, why this code should be touch in a new back-end.
 """
 
 from datetime import datetime
+from functools import lru_cache
 from typing import Annotated, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
 # String that is allowed for the attribute id
 AttributeIdStr = Literal["configs", "job", "results", "status"]
@@ -334,15 +335,34 @@ class GateInstruction(BaseModel):
     def config_dict(cls) -> dict:
         """
         Give back the properties of the instruction such as needed for the server.
+
+        The properties are class constants, so they are only looked up once per class.
+        Every caller gets a new dict with new lists, which it may modify.
         """
+        name, description, parameters, qasm_def, coupling_map = cls._config_items()
         return {
-            "coupling_map": cls.model_fields["coupling_map"].default,
-            "description": cls.model_fields["description"].default,
-            "name": cls.model_fields["name"].default,
-            "parameters": [cls.model_fields["parameters"].default],
-            "qasm_def": cls.model_fields["qasm_def"].default,
+            "coupling_map": [list(wires) for wires in coupling_map],
+            "description": description,
+            "name": name,
+            "parameters": [parameters],
+            "qasm_def": qasm_def,
         }
 
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _config_items(cls) -> tuple[str, str, str, str, tuple[tuple, ...]]:
+        """
+        Look up the properties of the instruction once per class. The coupling map is
+        kept as tuples, such that the cached values cannot be modified.
+        """
+        return (
+            cls.model_fields["name"].default,
+            cls.model_fields["description"].default,
+            cls.model_fields["parameters"].default,
+            cls.model_fields["qasm_def"].default,
+            tuple(tuple(wires) for wires in cls.model_fields["coupling_map"].default),
+        )
+
     @field_validator("wires")
     @classmethod
     def valid_coupling(cls, wires: list) -> list:
@@ -404,3 +424,40 @@ def get_init_results() -> ResultDict:
         success=True,
         status="INITIALIZING",
     )
+
+
+# the validators are built only once and then reused for every status and result
+_STATUS_ADAPTER = TypeAdapter(StatusMsgDict)
+_RESULT_ADAPTER = TypeAdapter(ResultDict)
+
+
+def validate_status(status_dict: dict) -> StatusMsgDict:
+    """
+    A support function that validates a status message with the cached validator.
+
+    Args:
+        status_dict: the raw status message
+
+    Returns:
+        the validated status message
+
+    Raises:
+        ValidationError: If the status message is not valid
+    """
+    return _STATUS_ADAPTER.validate_python(status_dict)
+
+
+def validate_result(result_dict: dict) -> ResultDict:
+    """
+    A support function that validates a result dict with the cached validator.
+
+    Args:
+        result_dict: the raw result dict
+
+    Returns:
+        the validated result dict
+
+    Raises:
+        ValidationError: If the result dict is not valid
+    """
+    return _RESULT_ADAPTER.validate_python(result_dict)
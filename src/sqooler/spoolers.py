@@ -9,13 +9,14 @@ jobs in labscript directly.
 
 import logging
 import os
+import re
 from abc import ABC
 from binascii import Error as BinasciiError
 from time import sleep
-from typing import Any, Callable, Optional, Type
+from typing import Annotated, Any, Callable, Literal, Optional, Protocol, Type, Union
 
 from decouple import config
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 
 from .schemes import (
     BackendConfigSchemaIn,
@@ -31,6 +32,31 @@ from .schemes import (
 )
 from .security import JWK, jwk_from_config_str
 
+# removes the brackets and commas of a shot in a single pass
+_MEMORY_TRANS = str.maketrans("", "", "[],")
+
+
+class _ArrayLike(Protocol):
+    """
+    Arrays like the ones of numpy, which can be converted into nested lists.
+    """
+
+    def tolist(self) -> list:
+        """
+        Give back the content of the array as nested lists.
+        """
+
+
+# the name of an experiment together with its number
+_EXP_KEY_RE = re.compile(r"experiment_([0-9]+)")
+
+# the suffixes that are added to the status if a job fails the checks
+_JSON_FAIL = "; Failed json sanity check. File will be deleted. Error message : "
+_DIM_FAIL = (
+    "; Failed dimensionality test. Too many atoms. File will be deleted. "
+    "Error message : "
+)
+
 
 class BaseSpooler(ABC):
     """
@@ -38,6 +64,8 @@ class BaseSpooler(ABC):
 
     Attributes:
         ins_schema_dict : A dictionary the contains all the allowed instructions for this spooler.
+            The validators and the gate configuration are built when it is assigned,
+            so assign a new dictionary to change the instructions.
         device_config: A dictionary that some main config params for the experiment.
         n_wires: maximum number of wires for the spooler
         n_max_shots: the maximum number of shots for the spooler
@@ -47,6 +75,10 @@ class BaseSpooler(ABC):
         wire_order: the order of the wires
         num_species: the number of atomic species in the experiment
         sign: sign the results of the job
+        display_name: the name of the backend. It is set through `configure`.
+        trusted: skip the validation of the instructions. Only their names and shape
+            are checked, so this must only be set if the jobs were already
+            validated upstream. Spoolers that face external input keep it `False`.
     """
 
     def __init__(
@@ -62,10 +94,15 @@ class BaseSpooler(ABC):
         wire_order: WireOrderStr = "interleaved",
         num_species: int = 1,
         sign: bool = False,
+        trusted: bool = False,
     ):
         """
         The constructor of the class.
         """
+        self._ins_schema_dict: dict = {}
+        self._ins_validators: dict[str, Callable[[dict], BaseModel]] = {}
+        self._ins_adapter: Optional[TypeAdapter] = None
+        self._gate_list: list[dict] = []
         self.ins_schema_dict = ins_schema_dict
         self.device_config = device_config
         self.n_max_shots = n_max_shots
@@ -76,8 +113,59 @@ class BaseSpooler(ABC):
         self.n_max_experiments = n_max_experiments
         self.wire_order = wire_order
         self.num_species = num_species
-        self._display_name: str = ""
+        self.display_name: str = ""
         self.sign = sign
+        self.trusted = trusted
+
+        # the names of the experiments that are allowed for n_max_experiments
+        self._valid_exp_keys: tuple[int, frozenset[str]] = (-1, frozenset())
+
+    @property
+    def ins_schema_dict(self) -> dict:
+        """
+        The allowed instructions of the spooler.
+        """
+        return self._ins_schema_dict
+
+    @ins_schema_dict.setter
+    def ins_schema_dict(self, ins_schema_dict: dict) -> None:
+        """
+        Set the allowed instructions and build the validators and the configuration
+        of the gates for them.
+
+        Args:
+            ins_schema_dict: The allowed instructions of the spooler.
+        """
+        self._ins_schema_dict = ins_schema_dict
+        # the validators are looked up once per instruction name instead of per call
+        self._ins_validators = {
+            name: schema.model_validate for name, schema in ins_schema_dict.items()
+        }
+        # validates the whole list of instructions in one call if possible
+        self._ins_adapter = _build_ins_adapter(ins_schema_dict)
+        # the configuration of the gates only changes with the instructions
+        self._gate_list = [
+            schema.config_dict()
+            for schema in ins_schema_dict.values()
+            if "is_gate" in schema.model_fields
+        ]
+
+    def _get_valid_exp_keys(self) -> frozenset[str]:
+        """
+        The names of all the experiments that are allowed. They are rebuilt only if
+        `n_max_experiments` was changed.
+
+        Returns:
+            The allowed names of the experiments.
+        """
+        n_max_experiments, valid_keys = self._valid_exp_keys
+        if n_max_experiments != self.n_max_experiments:
+            n_max_experiments = self.n_max_experiments
+            valid_keys = frozenset(
+                f"experiment_{i}" for i in range(n_max_experiments + 1)
+            )
+            self._valid_exp_keys = (n_max_experiments, valid_keys)
+        return valid_keys
 
     def check_experiment(self, exper_dict: dict) -> tuple[str, bool]:
         """
@@ -111,19 +199,15 @@ class BaseSpooler(ABC):
         Returns:
             The configuration dictionary of the spooler.
         """
-        gate_list = []
-        for _, ins_obj in self.ins_schema_dict.items():
-            if "is_gate" in ins_obj.model_fields:
-                gate_list.append(ins_obj.config_dict())
         backend_config_dict = {
             "description": self.description,
             "version": self.version,
             "cold_atom_type": self.cold_atom_type,
-            "gates": gate_list,
+            "gates": list(self._gate_list),
             "max_experiments": self.n_max_experiments,
             "max_shots": self.n_max_shots,
             "simulator": True,
-            "supported_instructions": list(self.ins_schema_dict.keys()),
+            "supported_instructions": list(self.ins_schema_dict),
             "num_wires": self.n_wires,
             "wire_order": self.wire_order,
             "num_species": self.num_species,
@@ -152,24 +236,51 @@ class BaseSpooler(ABC):
             exp_ok = False
             return err_code, exp_ok
 
+        ins_dicts = []
+        dispatch = []
         for ins in ins_list:
-            try:
-                gate_instr = gate_dict_from_list(ins)
-                # see if the instruction is part of the allowed instructions
-                if gate_instr.name not in self.ins_schema_dict.keys():
-                    err_code = f"Instruction {gate_instr.name} not allowed."
-                    exp_ok = False
-                    return err_code, exp_ok
+            # a cheap check of the shape before we go into the full validation
+            if not isinstance(ins, (list, tuple)) or len(ins) != 3:
+                err_code = (
+                    f"Instruction {ins} must be of the form [name, wires, params]."
+                )
+                return err_code, exp_ok
+            name = ins[0]
+            # see if the instruction is part of the allowed instructions
+            validator = (
+                self._ins_validators.get(name) if isinstance(name, str) else None
+            )
+            if validator is None:
+                err_code = f"Instruction {name} not allowed."
+                return err_code, exp_ok
+            ins_dict = {"name": name, "wires": ins[1], "params": ins[2]}
+            ins_dicts.append(ins_dict)
+            dispatch.append((validator, ins_dict))
+
+        if not ins_dicts:
+            return err_code, exp_ok
 
-                # now verify that the parameters are ok
-                gate_dict = gate_instr.model_dump()
-                self.ins_schema_dict[gate_instr.name](**gate_dict)
-                exp_ok = True
-            except ValidationError as err:
-                err_code = "Error in instruction " + str(err)
-                exp_ok = False
-            if not exp_ok:
-                break
+        # trusted jobs were validated upstream, so the names and the shape are enough
+        if self.trusted:
+            return err_code, True
+
+        # now verify that the parameters are ok
+        try:
+            if self._ins_adapter is None:
+                for validator, ins_dict in dispatch:
+                    validator(ins_dict)
+            else:
+                try:
+                    self._ins_adapter.validate_python(ins_dicts)
+                except ValidationError as err:
+                    # report the first invalid instruction in the same way as the
+                    # validation of the single instructions
+                    validator, ins_dict = dispatch[int(err.errors()[0]["loc"][0])]
+                    validator(ins_dict)
+                    raise
+            exp_ok = True
+        except ValidationError as err:
+            err_code = "Error in instruction " + str(err)
         return err_code, exp_ok
 
     def check_dimension(self, json_dict: dict) -> tuple[str, bool]:
@@ -206,33 +317,43 @@ class BaseSpooler(ABC):
         err_code = "No instructions received."
         exp_ok = False
         clean_dict: dict[str, ExperimentalInputDict] = {}
-        for expr in json_dict:
-            err_code = "Wrong experiment name or too many experiments"
+        # the names only need to be parsed one by one if one of them is not valid
+        names_ok = self._get_valid_exp_keys().issuperset(json_dict)
+        n_max_experiments = self.n_max_experiments
+        for expr, exp_data in json_dict.items():
             # test the name of the experiment
-            if not expr.startswith("experiment_"):
-                err_code = "Experiment name must start with experiment_"
-                exp_ok = False
-                break
-            if not expr[11:].isdigit():
-                err_code = "Experiment name must end with a number"
-                exp_ok = False
-                break
-            if int(expr[11:]) > self.n_max_experiments:
-                err_code = f"Experiment number too high. Must be less than {self.n_max_experiments}"
-                exp_ok = False
-                break
-            exp_ok = True
+            if not names_ok:
+                exp_match = _EXP_KEY_RE.fullmatch(expr)
+                if exp_match is None:
+                    if not expr.startswith("experiment_"):
+                        err_code = "Experiment name must start with experiment_"
+                    else:
+                        err_code = "Experiment name must end with a number"
+                    exp_ok = False
+                    break
+                if int(exp_match.group(1)) > n_max_experiments:
+                    err_code = (
+                        "Experiment number too high. "
+                        f"Must be less than {n_max_experiments}"
+                    )
+                    exp_ok = False
+                    break
 
             # test the structure of the experiment
-            err_code, exp_ok = self.check_experiment(json_dict[expr])
+            err_code, exp_ok = self.check_experiment(exp_data)
             if not exp_ok:
                 break
             # time to check the structure of the instructions
-            ins_list = json_dict[expr]["instructions"]
-            err_code, exp_ok = self.check_instructions(ins_list)
+            err_code, exp_ok = self.check_instructions(exp_data["instructions"])
             if not exp_ok:
                 break
-            clean_dict[expr] = self.get_exp_input_dict(json_dict[expr])
+            # trusted instructions were not validated yet, so they might still fail here
+            try:
+                clean_dict[expr] = self.get_exp_input_dict(exp_data)
+            except ValidationError as err:
+                err_code = "Error in instruction " + str(err)
+                exp_ok = False
+                break
         return err_code.replace("\n", ".."), exp_ok, clean_dict
 
     def _prep_job(
@@ -267,14 +388,9 @@ class BaseSpooler(ABC):
         err_msg, json_is_fine, clean_dict = self.check_json_dict(json_dict)
 
         if not json_is_fine:
-            status_msg_dict.detail += (
-                "; Failed json sanity check. File will be deleted. Error message : "
-                + err_msg
-            )
-            status_msg_dict.error_message += (
-                "; Failed json sanity check. File will be deleted. Error message : "
-                + err_msg
-            )
+            msg = _JSON_FAIL + err_msg
+            status_msg_dict.detail += msg
+            status_msg_dict.error_message += msg
             status_msg_dict.status = "ERROR"
             logging.error(
                 "Error in json compatibility test.",
@@ -285,14 +401,9 @@ class BaseSpooler(ABC):
         # now we need to check the dimensionality of the experiment
         dim_err_msg, dim_ok = self.check_dimension(json_dict)
         if not dim_ok:
-            status_msg_dict.detail += (
-                "; Failed dimensionality test. Too many atoms. File will be deleted. Error message : "
-                + dim_err_msg
-            )
-            status_msg_dict.error_message += (
-                "; Failed dimensionality test. Too many atoms. File will be deleted. Error message :  "
-                + dim_err_msg
-            )
+            msg = _DIM_FAIL + dim_err_msg
+            status_msg_dict.detail += msg
+            status_msg_dict.error_message += msg
             status_msg_dict.status = "ERROR"
             logging.error(
                 "Error in dimensionality test.",
@@ -302,19 +413,21 @@ class BaseSpooler(ABC):
 
         return result_dict, status_msg_dict, clean_dict
 
-    @property
-    def display_name(self) -> str:
-        """
-        The name of the spooler.
+    def configure(self, display_name: Optional[str] = None) -> None:
         """
-        return self._display_name
+        Configure the spooler once before it processes jobs. The checks happen here,
+        such that the attributes can be read without any overhead afterwards.
+
+        Args:
+            display_name: The name of the backend.
 
-    @display_name.setter
-    def display_name(self, value: str) -> None:
-        if isinstance(value, str):  # Check if the provided value is a string
-            self._display_name = value
-        else:
-            raise ValueError("display_name must be a string")
+        Raises:
+            ValueError: if the display_name is not a string
+        """
+        if display_name is not None:
+            if not isinstance(display_name, str):
+                raise ValueError("display_name must be a string")
+            self.display_name = display_name
 
     def get_exp_input_dict(self, json_dict: dict) -> ExperimentalInputDict:
         """
@@ -328,12 +441,6 @@ class BaseSpooler(ABC):
         """
         raw_ins_list = json_dict["instructions"]
         ins_list = [gate_dict_from_list(instr) for instr in raw_ins_list]
-        exp_info = ExperimentalInputDict(
-            instructions=ins_list,
-            shots=json_dict["shots"],
-            wire_order=json_dict["wire_order"],
-            num_wires=json_dict["num_wires"],
-        )
         exp_info = ExperimentalInputDict(
             instructions=ins_list,
             shots=json_dict["shots"],
@@ -372,26 +479,75 @@ class BaseSpooler(ABC):
 class Spooler(BaseSpooler):
     """
     The class for the spooler as it can be used for simulators.
+
+    Attributes:
+        gen_circuit: The function that generates the circuit. The first argument is
+            the name of the experiment and the second argument is the dictionary with
+            the instructions. It can be set through `set_gen_circuit` or `configure`,
+            which check that it is callable.
     """
 
-    @property
-    def gen_circuit(self) -> Callable[[str, ExperimentalInputDict], ExperimentDict]:
+    def __init__(
+        self,
+        ins_schema_dict: dict,
+        device_config: Type[BaseModel],
+        n_wires: int,
+        description: str = "",
+        n_max_shots: int = 1000,
+        version: str = "0.0.1",
+        cold_atom_type: ColdAtomStr = "spin",
+        n_max_experiments: int = 15,
+        wire_order: WireOrderStr = "interleaved",
+        num_species: int = 1,
+        sign: bool = False,
+        trusted: bool = False,
+    ):
+        """
+        The constructor of the class. The arguments are the same as for the
+        BaseSpooler class.
+        """
+        super().__init__(
+            ins_schema_dict,
+            device_config,
+            n_wires,
+            description,
+            n_max_shots,
+            version,
+            cold_atom_type,
+            n_max_experiments,
+            wire_order,
+            num_species,
+            sign,
+            trusted,
+        )
+        # a plain attribute, such that the calls in `add_job` are simple lookups
+        self.gen_circuit: Callable[[str, ExperimentalInputDict], ExperimentDict] = (
+            _gen_circuit_not_set
+        )
+
+    def configure(
+        self,
+        display_name: Optional[str] = None,
+        gen_circuit: Optional[
+            Callable[[str, ExperimentalInputDict], ExperimentDict]
+        ] = None,
+    ) -> None:
         """
-        The function that generates the circuit.
-        It can be basically anything that allows the execution of the circuit.
+        Configure the spooler once before it processes jobs.
 
-        Returns:
-            The function that generates the circuit.
+        Args:
+            display_name: The name of the backend.
+            gen_circuit: The function that generates the circuit.
 
         Raises:
-            ValueError: if the gen_circuit is not a callable function
+            ValueError: if the display_name is not a string or the gen_circuit is not
+                a callable function
         """
-        if not hasattr(self, "_gen_circuit"):
-            raise ValueError("gen_circuit must be set")
-        return self._gen_circuit
+        super().configure(display_name=display_name)
+        if gen_circuit is not None:
+            self.set_gen_circuit(gen_circuit)
 
-    @gen_circuit.setter
-    def gen_circuit(
+    def set_gen_circuit(
         self, value: Callable[[str, ExperimentalInputDict], ExperimentDict]
     ) -> None:
         """
@@ -400,11 +556,13 @@ class Spooler(BaseSpooler):
 
         Args:
             value: The function that generates the circuit.
+
+        Raises:
+            ValueError: if the gen_circuit is not a callable function
         """
-        if callable(value):  # Check if the provided value is a callable (function)
-            self._gen_circuit = value
-        else:
+        if not callable(value):
             raise ValueError("gen_circuit must be a callable function")
+        self.gen_circuit = value
 
     def add_job(
         self, json_dict: dict[str, dict], job_id: str
@@ -425,13 +583,13 @@ class Spooler(BaseSpooler):
         result_dict, status_msg_dict, clean_dict = self._prep_job(json_dict, job_id)
         if status_msg_dict.status == "ERROR":
             return result_dict, status_msg_dict
-        # now we can generate the circuit for each experiment
+        # now we can generate the circuit for each experiment. The lookups are bound
+        # once outside of the loop.
+        append_result = result_dict.results.append
+        gen_circuit = self.gen_circuit
         for exp_name, exp_info in clean_dict.items():
             try:
-                # not sure why pylint is complaining here so we disable it
-                result_dict.results.append(
-                    self.gen_circuit(exp_name, exp_info)  # pylint: disable=E1102
-                )
+                append_result(gen_circuit(exp_name, exp_info))
                 logging.info("Experiment %s done.", exp_name)
             except ValueError as err:
                 status_msg_dict.detail += "; " + str(err)
@@ -476,6 +634,7 @@ class LabscriptSpooler(BaseSpooler):
         wire_order: WireOrderStr = "interleaved",
         num_species: int = 1,
         sign: bool = False,
+        trusted: bool = False,
     ):
         """
         The constructor of the class. The  arguments are the same as for the Spooler
@@ -495,6 +654,7 @@ class LabscriptSpooler(BaseSpooler):
             wire_order,
             num_species,
             sign,
+            trusted,
         )
         self.remote_client = remote_client
         self.labscript_params = labscript_params
@@ -681,6 +841,49 @@ class LabscriptSpooler(BaseSpooler):
         return exp_sub_dict
 
 
+def _gen_circuit_not_set(
+    exp_name: str, exp_info: ExperimentalInputDict
+) -> ExperimentDict:
+    """
+    The default of `Spooler.gen_circuit` until the function is set.
+
+    Args:
+        exp_name: The name of the experiment.
+        exp_info: The dictionary with the instructions of the experiment.
+
+    Raises:
+        ValueError: as the gen_circuit was not set
+    """
+    raise ValueError("gen_circuit must be set")
+
+
+def _build_ins_adapter(ins_schema_dict: dict) -> Optional[TypeAdapter]:
+    """
+    Build a validator for a whole list of instructions. The instructions are told apart
+    by their name, so this only works if every schema fixes its name to the key under
+    which it is registered.
+
+    Args:
+        ins_schema_dict: The allowed instructions of the spooler.
+
+    Returns:
+        The validator for the list of instructions or `None` if the schemas do not
+        allow for it.
+    """
+    schemas = tuple(ins_schema_dict.values())
+    if not schemas:
+        return None
+    if len(schemas) == 1:
+        return TypeAdapter(list[schemas[0]])  # type: ignore
+    for name, schema in ins_schema_dict.items():
+        name_field = schema.model_fields.get("name")
+        if name_field is None or name_field.annotation != Literal[name]:
+            return None
+    return TypeAdapter(
+        list[Annotated[Union[schemas], Field(discriminator="name")]]  # type: ignore
+    )
+
+
 def gate_dict_from_list(inst_list: list) -> GateDict:
     """
     Transforms a list into an appropiate dictionnary for instructions. The list
@@ -713,16 +916,14 @@ def get_file_queue(dir_path: str) -> list[str]:
     # make sure that the path is an existing directory
     if not os.path.isdir(dir_path):
         raise ValueError(f"The path {dir_path} is not a directory.")
-    files = [
-        file
-        for file in os.listdir(dir_path)
-        if os.path.isfile(os.path.join(dir_path, file))
-    ]
+    # the entries of scandir know their type, so we do not need a stat per file
+    with os.scandir(dir_path) as entries:
+        files = [entry.name for entry in entries if entry.is_file()]
     return files
 
 
 def create_memory_data(
-    shots_array: list,
+    shots_array: Union[list, _ArrayLike],
     exp_name: str,
     n_shots: int,
     instructions: Optional[list[GateDict]] = None,
@@ -732,7 +933,8 @@ def create_memory_data(
     with proprer formatting.
 
     Args:
-        shots_array: The array with the shots.
+        shots_array: The array with the shots. Arrays like the ones of numpy are
+            converted into lists in one go before they are formatted.
         exp_name: The name of the experiment.
         n_shots: The number of shots.
         instructions: The list of instructions that were executed
@@ -740,20 +942,19 @@ def create_memory_data(
     Returns:
         The ExperimentDict object describing the results.
     """
-    exp_sub_dict: dict = {
-        "header": {"name": "experiment_0", "extra metadata": "text"},
-        "shots": 3,
-        "success": True,
-        "data": {"memory": None},
-    }
+    # converting the whole array at once is much cheaper than formatting every row
+    # of the array, which also shortens long rows with "..."
+    if not isinstance(shots_array, list):
+        shots_array = shots_array.tolist()
+    memory_list = [str(shot).translate(_MEMORY_TRANS) for shot in shots_array]
 
-    exp_sub_dict["header"]["name"] = exp_name
-    exp_sub_dict["shots"] = n_shots
-    memory_list = [
-        str(shot).replace("[", "").replace("]", "").replace(",", "")
-        for shot in shots_array
-    ]
-    exp_sub_dict["data"]["memory"] = memory_list
+    data_dict: dict = {"memory": memory_list}
     if instructions is not None:
-        exp_sub_dict["data"]["instructions"] = instructions
+        data_dict["instructions"] = instructions
+    exp_sub_dict = {
+        "header": {"name": exp_name, "extra metadata": "text"},
+        "shots": n_shots,
+        "success": True,
+        "data": data_dict,
+    }
     return ExperimentDict(**exp_sub_dict)
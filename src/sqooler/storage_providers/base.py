@@ -9,7 +9,8 @@ import re
 import warnings
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from typing import Any, Callable, Mapping, Optional
+from itertools import islice
+from typing import Any, Callable, Iterator, Mapping, Optional
 
 from decouple import config
 
@@ -25,10 +26,19 @@ from ..schemes import (
     PksStr,
     ResultDict,
     StatusMsgDict,
+    validate_result,
+    validate_status,
 )
 from ..security import JWK, JWSDict, sign_payload
 
 
+class StorageAuthError(RuntimeError):
+    """
+    The storage provider could not authenticate with the storage. In contrast to
+    exiting the process, the caller can simply try again later with fresh credentials.
+    """
+
+
 def validate_active(func: Callable) -> Callable:
     """
     Decorator to check if the storage provider is active.
@@ -321,7 +331,7 @@ class StorageProvider(StorageCore):
             "detail": "Got your json.",
             "error_message": "None",
         }
-        status_dict = StatusMsgDict(**status_draft)
+        status_dict = validate_status(status_draft)
         self._format_status_dict(
             status_dict,
             status_json_dir,
@@ -357,7 +367,7 @@ class StorageProvider(StorageCore):
                 "detail": "Could not find the status file.",
                 "error_message": f"Missing status file for {job_id}.",
             }
-            return StatusMsgDict(**status_draft)
+            return validate_status(status_draft)
 
         return self._adapt_status_dict(status_dict)
 
@@ -611,7 +621,7 @@ class StorageProvider(StorageCore):
     @abstractmethod
     def update_in_database(
         self,
-        result_dict: ResultDict,
+        result_dict: Optional[ResultDict],
         status_msg_dict: StatusMsgDict,
         job_id: str,
         display_name: DisplayNameStr,
@@ -621,7 +631,8 @@ class StorageProvider(StorageCore):
         Upload the status and result to the `StorageProvider`.
 
         Args:
-            result_dict: the dictionary containing the result of the job
+            result_dict: the dictionary containing the result of the job. It may be None
+                if the job is not DONE, e.g. for the intermediate status updates.
             status_msg_dict: the dictionary containing the status message of the job
             job_id: the name of the job
             display_name: the name of the backend
@@ -643,6 +654,33 @@ class StorageProvider(StorageCore):
             A list of files that was found.
         """
 
+    def iter_file_queue(
+        self, storage_path: str, page_size: int = 1  # pylint: disable=unused-argument
+    ) -> Iterator[str]:
+        """
+        Iterate over the files in the queue. In contrast to `get_file_queue` the
+        providers can overwrite this function to only look up as many files as the
+        caller actually consumes.
+
+        Args:
+            storage_path: Where are we looking for the files.
+            page_size: The number of files that the caller needs at once. Providers
+                that list the files in pages request at least that many per page.
+
+        Yields:
+            The names of the files that were found.
+        """
+        yield from self.get_file_queue(storage_path)
+
+    def register_backend_paths(self, display_name: DisplayNameStr) -> None:
+        """
+        Prepare the paths that are used for every job of the backend. Providers that
+        can resolve their paths ahead of time overwrite this function.
+
+        Args:
+            display_name: The name of the backend
+        """
+
     def get_public_key(self, display_name: DisplayNameStr) -> JWK:
         """
         The function that gets the spooler public JWK for the device.
@@ -676,29 +714,81 @@ class StorageProvider(StorageCore):
         Returns:
             the path towards the job
         """
+        next_jobs = self.get_next_jobs_in_queue(display_name, 1, private_jwk)
+        if not next_jobs:
+            return NextJobSchema(**self._get_default_next_schema_dict())
+        return next_jobs[0]
+
+    def get_next_jobs_in_queue(
+        self,
+        display_name: DisplayNameStr,
+        n_jobs: int,
+        private_jwk: Optional[JWK] = None,
+    ) -> list[NextJobSchema]:
+        """
+        A function that claims up to `n_jobs` jobs from the queue at once.
 
+        Args:
+            display_name: The name of the backend
+            n_jobs: The maximal number of jobs that should be claimed
+            private_jwk: The private JWK to sign the job with
+
+        Returns:
+            The claimed jobs in the order of the queue. It is empty if the queue is empty.
+        """
         job_json_dir = self.get_attribute_path(
             attribute_name="queue", display_name=display_name
         )
-        job_dict = self._get_default_next_schema_dict()
-        job_list = self.get_file_queue(job_json_dir)
 
         # time stamp when we last looked for a job
         self.timestamp_queue(display_name, private_jwk)
-        # if there is a job, we should move it
-        if job_list:
-            job_json_name = job_list[0]
 
-            # we have to do this hack as things are slightly different for the Dropbox
-            if not job_json_name.startswith("job-"):
-                job_dict["job_id"] = job_json_name
-            else:
-                job_dict["job_id"] = job_json_name[4:]
+        running_path = self.get_attribute_path("running")
+        next_jobs: list[NextJobSchema] = []
+        # we only need as many jobs as we can claim, so there is no need to list the
+        # whole queue
+        job_queue = self.iter_file_queue(job_json_dir, page_size=n_jobs)
+        while len(next_jobs) < n_jobs:
+            job_json_names = list(islice(job_queue, n_jobs - len(next_jobs)))
+            if not job_json_names:
+                break
+            for job_json_name in self._claim_jobs(
+                job_json_dir, running_path, job_json_names
+            ):
+                # we have to do this hack as things are slightly different for the
+                # Dropbox
+                job_id = job_json_name.removeprefix("job-")
+                next_jobs.append(
+                    NextJobSchema(job_id=job_id, job_json_path=running_path)
+                )
+        return next_jobs
+
+    def _claim_jobs(
+        self, job_json_dir: str, running_path: str, job_json_names: list[str]
+    ) -> list[str]:
+        """
+        Claim the jobs by moving them from the queue into the running folder.
+        Providers that can move several files at once overwrite this function.
+
+        Args:
+            job_json_dir: The path of the queue
+            running_path: The path of the running jobs
+            job_json_names: The names of the jobs that should be claimed
 
-            # and move the file into the right directory
-            self.move(job_json_dir, self.get_attribute_path("running"), job_json_name)
-            job_dict["job_json_path"] = self.get_attribute_path("running")
-        return NextJobSchema(**job_dict)
+        Returns:
+            The names of the jobs that were claimed in the given order.
+        """
+        claimed_names = []
+        for job_json_name in job_json_names:
+            # moving the file claims the job. If it is gone, another worker was faster
+            # and we continue with the next job in the queue
+            try:
+                self.move(job_json_dir, running_path, job_json_name)
+            except FileNotFoundError:
+                logging.info("The job %s was already taken.", job_json_name)
+                continue
+            claimed_names.append(job_json_name)
+        return claimed_names
 
     def _common_upload_result(
         self,
@@ -723,6 +813,35 @@ class StorageProvider(StorageCore):
         Returns:
             The success of the upload process
         """
+        upload_dict = self._format_result_dict(
+            result_dict, display_name, job_id, private_jwk
+        )
+        self.upload(upload_dict, result_json_dir, result_json_name)
+        return True
+
+    def _format_result_dict(
+        self,
+        result_dict: ResultDict,
+        display_name: DisplayNameStr,
+        job_id: str,
+        private_jwk: Optional[JWK] = None,
+    ) -> dict:
+        """
+        Format the result dict such that it can be written to the storage. It is signed
+        if the backend is configured to sign.
+
+        Args:
+            result_dict: The dictionary containing the result of the job
+            display_name: The name of the backend
+            job_id: The name of the job
+            private_jwk: The private JWK to sign the result with
+
+        Returns:
+            The dict representation of the result
+
+        Raises:
+            ValueError: If the backend is configured to sign, but no private key is given
+        """
         # make sure that the job_id is in the result_dict
         if not result_dict.job_id == job_id:
             logging.warning(
@@ -739,10 +858,8 @@ class StorageProvider(StorageCore):
                 )
             # we should sign the result
             signed_result = sign_payload(result_dict.model_dump(), private_jwk)
-            self.upload(signed_result.model_dump(), result_json_dir, result_json_name)
-        else:
-            self.upload(result_dict.model_dump(), result_json_dir, result_json_name)
-        return True
+            return signed_result.model_dump()
+        return result_dict.model_dump()
 
     def _verify_config(
         self, config_dict: BackendConfigSchemaIn, display_name: DisplayNameStr
@@ -913,10 +1030,10 @@ class StorageProvider(StorageCore):
         if set(result_dict.keys()) == expected_keys_for_jws:
             result_payload = result_dict["payload"]
             result_payload["backend_name"] = backend_config_info.backend_name
-            typed_result = ResultDict(**result_payload)
+            typed_result = validate_result(result_payload)
         else:
             result_dict["backend_name"] = backend_config_info.backend_name
-            typed_result = ResultDict(**result_dict)
+            typed_result = validate_result(result_dict)
         return typed_result
 
     def _adapt_status_dict(self, status_dict: dict) -> StatusMsgDict:
@@ -933,9 +1050,9 @@ class StorageProvider(StorageCore):
         # done day we should verify the result before we send it out
         expected_keys_for_jws = {"header", "payload", "signature"}
         if set(status_dict.keys()) == expected_keys_for_jws:
-            typed_result = StatusMsgDict(**status_dict["payload"])
+            typed_result = validate_status(status_dict["payload"])
         else:
-            typed_result = StatusMsgDict(**status_dict)
+            typed_result = validate_status(status_dict)
         return typed_result
 
     def timestamp_queue(
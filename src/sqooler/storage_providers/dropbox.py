@@ -6,14 +6,22 @@ The module that contains all the necessary logic for communication with the Drop
 import datetime
 import json
 import logging
-import sys
+import threading
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import closing
 from datetime import timezone
-from typing import Mapping, Optional
+from typing import Any, Callable, Iterator, Mapping, Optional, Sequence
 
 import dropbox
 from dropbox.exceptions import ApiError, AuthError
-from dropbox.files import WriteMode
+from dropbox.files import (
+    CommitInfo,
+    UploadSessionCursor,
+    UploadSessionFinishArg,
+    UploadSessionType,
+    WriteMode,
+)
 
 from ..schemes import (
     AttributeIdStr,
@@ -27,7 +35,66 @@ from ..schemes import (
     StatusMsgDict,
 )
 from ..security import JWK
-from .base import StorageCore, StorageProvider, datetime_handler, validate_active
+from .base import (
+    StorageAuthError,
+    StorageCore,
+    StorageProvider,
+    datetime_handler,
+    validate_active,
+)
+
+# the requests to dropbox are dominated by the latency, so independent ones are sent
+# in parallel through this pool
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sqooler-dropbox")
+
+# one client per login, which is shared by all the providers. It keeps the access
+# token and the connections, such that new providers do not have to authenticate again.
+_DROPBOX_CLIENTS: dict[tuple[str, str, str], dropbox.Dropbox] = {}
+_DROPBOX_CLIENTS_LOCK = threading.Lock()
+
+# larger files are uploaded in chunks through a concurrent upload session. Dropbox
+# requires the chunks of such a session to be multiples of 4 MiB.
+_LARGE_UPLOAD_SIZE = 8 * 1024 * 1024
+_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# dropbox commits at most this many upload sessions in a single batch
+_MAX_BATCH_SIZE = 1000
+
+
+def _dump_json(content_dict: Mapping) -> bytes:
+    """
+    Serialize the content into the compact json bytes that are sent to dropbox.
+
+    Args:
+        content_dict: The content that should be serialized.
+
+    Returns:
+        The utf-8 encoded json.
+    """
+    return json.dumps(
+        content_dict, default=datetime_handler, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _run_parallel(*calls: Callable[[], Any]) -> None:
+    """
+    Run independent calls in parallel and wait for all of them. The first call runs in
+    the current thread and the others in the pool.
+
+    Args:
+        calls: The functions without arguments that should be called.
+
+    Raises:
+        Exception: The first exception raised by one of the calls in the given order.
+    """
+    first_call, *other_calls = calls
+    futures: list[Future] = [_EXECUTOR.submit(call) for call in other_calls]
+    try:
+        first_call()
+    finally:
+        wait(futures)
+    for future in futures:
+        future.result()
 
 
 class DropboxCore(StorageCore):
@@ -50,6 +117,111 @@ class DropboxCore(StorageCore):
         self.app_secret = login_dict.app_secret
         self.refresh_token = login_dict.refresh_token
 
+        # the client is created on the first call and shared by all the operations
+        self._client_key = (self.app_key, self.app_secret, self.refresh_token)
+
+    @staticmethod
+    def _full_path(storage_path: str, job_id: str) -> str:
+        """
+        Create the full path of a json file in the dropbox.
+
+        Args:
+            storage_path: the path where the file is stored, but excluding the file name
+            job_id: the name of the file without the .json extension
+
+        Returns:
+            The full path with a leading slash and the .json extension.
+        """
+        return f"/{storage_path.strip('/')}/{job_id}.json"
+
+    def _client(self) -> dropbox.Dropbox:
+        """
+        Get the Dropbox client of the login. It is created once and then reused by all
+        the providers with the same login, such that neither the authentication nor
+        the connection have to be set up again.
+
+        The access token is obtained once while the client is created, such that
+        parallel calls do not all refresh it at the same time. Afterwards the SDK caches
+        it and only refreshes it shortly before it expires.
+
+        Raises:
+            StorageAuthError: If the access token cannot be obtained with the refresh
+                token.
+
+        Returns:
+            The shared Dropbox client.
+        """
+        dbx = _DROPBOX_CLIENTS.get(self._client_key)
+        if dbx is None:
+            with _DROPBOX_CLIENTS_LOCK:
+                dbx = _DROPBOX_CLIENTS.get(self._client_key)
+                if dbx is None:
+                    dbx = dropbox.Dropbox(
+                        app_key=self.app_key,
+                        app_secret=self.app_secret,
+                        oauth2_refresh_token=self.refresh_token,
+                    )
+                    try:
+                        dbx.check_and_refresh_access_token()
+                    except AuthError as err:
+                        raise StorageAuthError(
+                            "Invalid refresh token for dropbox."
+                        ) from err
+                    _DROPBOX_CLIENTS[self._client_key] = dbx
+        return dbx
+
+    def _discard_client(self, dbx: dropbox.Dropbox) -> None:
+        """
+        Forget the shared client, such that the next call creates a new one. A client
+        that another thread created in the meantime is kept.
+
+        Args:
+            dbx: The client that should not be used anymore.
+        """
+        with _DROPBOX_CLIENTS_LOCK:
+            if _DROPBOX_CLIENTS.get(self._client_key) is dbx:
+                del _DROPBOX_CLIENTS[self._client_key]
+
+    def close(self) -> None:
+        """
+        Close the connections of the shared Dropbox client. This affects all the
+        providers with the same login. A later call creates a new client.
+        """
+        with _DROPBOX_CLIENTS_LOCK:
+            dbx = _DROPBOX_CLIENTS.pop(self._client_key, None)
+        if dbx is not None:
+            dbx.close()
+
+    def _api_call(self, endpoint: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call an endpoint of the Dropbox API with the shared client. If the
+        authentication fails, the client is created again and the call is retried once.
+
+        Args:
+            endpoint: The name of the method of the Dropbox client, e.g. `files_upload`
+            *args: The positional arguments of the endpoint
+            **kwargs: The keyword arguments of the endpoint
+
+        Raises:
+            StorageAuthError: If the authentication fails a second time or the access
+                token cannot be obtained.
+
+        Returns:
+            The response of the endpoint.
+        """
+        dbx = self._client()
+        try:
+            return getattr(dbx, endpoint)(*args, **kwargs)
+        except AuthError:
+            self._discard_client(dbx)
+        # the new client refreshes the access token with the refresh token
+        dbx = self._client()
+        try:
+            return getattr(dbx, endpoint)(*args, **kwargs)
+        except AuthError as err:
+            self._discard_client(dbx)
+            raise StorageAuthError("Invalid access token for dropbox.") from err
+
     def upload_string(
         self, content_string: str, storage_path: str, job_id: str
     ) -> None:
@@ -62,24 +234,81 @@ class DropboxCore(StorageCore):
             job_id: the name of the file without the .json extension
         """
 
-        # strip trailing and leading slashes from the storage_path
-        storage_path = storage_path.strip("/")
+        self._upload_bytes(content_string.encode("utf-8"), storage_path, job_id)
+
+    def _upload_bytes(self, payload: bytes, storage_path: str, job_id: str) -> None:
+        """
+        Upload the already encoded payload as a json file to the dropbox
+
+        Args:
+            payload: the encoded content of the file that should be uploaded
+            storage_path: the path where the file should be stored, but excluding the file name
+            job_id: the name of the file without the .json extension
+        """
+
+        full_path = self._full_path(storage_path, job_id)
+        if len(payload) > _LARGE_UPLOAD_SIZE:
+            self._upload_large(payload, full_path)
+            return
+
+        self._api_call(
+            "files_upload",
+            payload,
+            full_path,
+            mode=WriteMode("overwrite"),
+        )
+
+    def _upload_large(self, payload: bytes, full_path: str) -> None:
+        """
+        Upload a large payload in chunks that are sent in parallel through a
+        concurrent upload session.
+
+        Args:
+            payload: the encoded content of the file that should be uploaded
+            full_path: the full path of the file in the dropbox
+        """
+        session_id = self._start_large_session(payload)
+        self._api_call(
+            "files_upload_session_finish",
+            b"",
+            UploadSessionCursor(session_id=session_id, offset=len(payload)),
+            CommitInfo(path=full_path, mode=WriteMode("overwrite")),
+        )
 
-        # create the full path
-        full_path = "/" + storage_path + "/" + job_id + ".json"
+    def _start_large_session(self, payload: bytes) -> str:
+        """
+        Send a large payload in chunks in parallel through a concurrent upload session.
+        The session is closed, but the file is not committed yet.
+
+        Args:
+            payload: the encoded content of the file that should be uploaded
 
-        # Create an instance of a Dropbox class, which can make requests to the API.
-        with dropbox.Dropbox(
-            app_key=self.app_key,
-            app_secret=self.app_secret,
-            oauth2_refresh_token=self.refresh_token,
-        ) as dbx:
-            # Check that the access token is valid
-            dbx.users_get_current_account()
-            dbx.files_upload(
-                content_string.encode("utf-8"), full_path, mode=WriteMode("overwrite")
+        Returns:
+            The id of the upload session.
+        """
+        session_id = self._api_call(
+            "files_upload_session_start",
+            b"",
+            session_type=UploadSessionType.concurrent,
+        ).session_id
+
+        def append_chunk(offset: int) -> None:
+            end = offset + _UPLOAD_CHUNK_SIZE
+            cursor = UploadSessionCursor(session_id=session_id, offset=offset)
+            # the last chunk closes the session
+            self._api_call(
+                "files_upload_session_append_v2",
+                payload[offset:end],
+                cursor,
+                close=end >= len(payload),
             )
 
+        # the uploads might already run in the shared pool, so the chunks get their
+        # own workers instead of waiting for free ones in the same pool
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(append_chunk, range(0, len(payload), _UPLOAD_CHUNK_SIZE)))
+        return session_id
+
     @validate_active
     def upload(self, content_dict: Mapping, storage_path: str, job_id: str) -> None:
         """
@@ -99,9 +328,7 @@ class DropboxCore(StorageCore):
                 f"The file {job_id} in {storage_path} already exists and should not be overwritten."
             )
         except FileNotFoundError:
-            # create the appropriate string for the dropbox API
-            dump_str = json.dumps(content_dict, default=datetime_handler)
-            self.upload_string(dump_str, storage_path, job_id)
+            self._upload_bytes(_dump_json(content_dict), storage_path, job_id)
 
     @validate_active
     def get(self, storage_path: str, job_id: str) -> dict:
@@ -112,29 +339,15 @@ class DropboxCore(StorageCore):
         job_id: the name of the file. Is a json file
         """
 
-        # strip trailing and leading slashes from the storage_path
-        storage_path = storage_path.strip("/")
-
-        # Create an instance of a Dropbox class, which can make requests to the API.
-        with dropbox.Dropbox(
-            app_key=self.app_key,
-            app_secret=self.app_secret,
-            oauth2_refresh_token=self.refresh_token,
-        ) as dbx:
-            # Check that the access token is valid
-            try:
-                dbx.users_get_current_account()
-            except AuthError:
-                sys.exit("ERROR: Invalid access token.")
-            full_path = "/" + storage_path + "/" + job_id + ".json"
-            try:
-                _, res = dbx.files_download(path=full_path)
-            except ApiError as err:
-                raise FileNotFoundError(
-                    f"Could not find file under {full_path}"
-                ) from err
-            data = res.content
-        return json.loads(data.decode("utf-8"))
+        full_path = self._full_path(storage_path, job_id)
+        try:
+            _, res = self._api_call("files_download", path=full_path)
+        except ApiError as err:
+            raise FileNotFoundError(f"Could not find file under {full_path}") from err
+        # json decodes the utf-8 bytes directly. The response is closed afterwards,
+        # such that the connection goes back into the pool of the shared client.
+        with closing(res):
+            return json.loads(res.content)
 
     @validate_active
     def update(self, content_dict: dict, storage_path: str, job_id: str) -> None:
@@ -149,34 +362,14 @@ class DropboxCore(StorageCore):
         Returns:
             None
         """
-        # create the appropriate string for the dropbox API
-        dump_str = json.dumps(content_dict, default=datetime_handler)
-
-        # strip trailing and leading slashes from the storage_path
-        storage_path = storage_path.strip("/")
-
-        # create the full path
-        full_path = "/" + storage_path + "/" + job_id + ".json"
-
-        # Create an instance of a Dropbox class, which can make requests to the API.
-        with dropbox.Dropbox(
-            app_key=self.app_key,
-            app_secret=self.app_secret,
-            oauth2_refresh_token=self.refresh_token,
-        ) as dbx:
-            # Check that the access token is valid
-            dbx.users_get_current_account()
+        full_path = self._full_path(storage_path, job_id)
 
-            try:
-                dbx.files_get_metadata(full_path)
-            except ApiError as err:
-                raise FileNotFoundError(
-                    f"Could not update file under {full_path}"
-                ) from err
+        try:
+            self._api_call("files_get_metadata", full_path)
+        except ApiError as err:
+            raise FileNotFoundError(f"Could not update file under {full_path}") from err
 
-            dbx.files_upload(
-                dump_str.encode("utf-8"), full_path, mode=WriteMode("overwrite")
-            )
+        self._upload_bytes(_dump_json(content_dict), storage_path, job_id)
 
     @validate_active
     def move(self, start_path: str, final_path: str, job_id: str) -> None:
@@ -189,22 +382,31 @@ class DropboxCore(StorageCore):
 
         Returns:
             None
-        """
-        # strip trailing and leading slashes from the paths
-        start_path = start_path.strip("/")
-        final_path = final_path.strip("/")
 
-        # Create an instance of a Dropbox class, which can make requests to the API.
-        with dropbox.Dropbox(
-            app_key=self.app_key,
-            app_secret=self.app_secret,
-            oauth2_refresh_token=self.refresh_token,
-        ) as dbx:
-            dbx.users_get_current_account()
-
-            full_start_path = "/" + start_path + "/" + job_id + ".json"
-            full_final_path = "/" + final_path + "/" + job_id + ".json"
-            dbx.files_move_v2(full_start_path, full_final_path)
+        Raises:
+            FileNotFoundError: If the file is not found under start_path
+            ApiError: If dropbox refuses the move for any other reason
+        """
+        full_start_path = self._full_path(start_path, job_id)
+        full_final_path = self._full_path(final_path, job_id)
+        try:
+            self._api_call(
+                "files_move_v2",
+                full_start_path,
+                full_final_path,
+                allow_shared_folder=False,
+                autorename=False,
+            )
+        except ApiError as err:
+            # the file is gone, e.g. because another worker moved it before us
+            if (
+                err.error.is_from_lookup()
+                and err.error.get_from_lookup().is_not_found()
+            ):
+                raise FileNotFoundError(
+                    f"Could not find file under {full_start_path}"
+                ) from err
+            raise
 
     @validate_active
     def delete(self, storage_path: str, job_id: str) -> None:
@@ -219,28 +421,118 @@ class DropboxCore(StorageCore):
             None
         """
 
-        # strip trailing and leading slashes from the storage_path
-        storage_path = storage_path.strip("/")
+        full_path = self._full_path(storage_path, job_id)
+        try:
+            _ = self._api_call("files_delete_v2", path=full_path)
+        except ApiError as err:
+            raise FileNotFoundError(f"Could not delete file under {full_path}") from err
 
-        # Create an instance of a Dropbox class, which can make requests to the API.
-        with dropbox.Dropbox(
-            app_key=self.app_key,
-            app_secret=self.app_secret,
-            oauth2_refresh_token=self.refresh_token,
-        ) as dbx:
-            # Check that the access token is valid
-            try:
-                dbx.users_get_current_account()
-            except AuthError:
-                sys.exit("ERROR: Invalid access token.")
+    @validate_active
+    def upload_many(self, items: Sequence[tuple[Mapping, str, str]]) -> None:
+        """
+        Upload several json files to the dropbox and commit them in a single batch.
+        Like `upload` it does not overwrite existing files. Dropbox allows up to 1000
+        files per batch.
 
-            full_path = "/" + storage_path + "/" + job_id + ".json"
-            try:
-                _ = dbx.files_delete_v2(path=full_path)
-            except ApiError as err:
-                raise FileNotFoundError(
-                    f"Could not delete file under {full_path}"
-                ) from err
+        Args:
+            items: the content, the storage path and the file name without the .json
+                extension of every file that should be uploaded
+        """
+        self._upload_batch(
+            [
+                (content_dict, path, job_id, False)
+                for content_dict, path, job_id in items
+            ]
+        )
+
+    def _upload_batch(self, items: Sequence[tuple[Mapping, str, str, bool]]) -> None:
+        """
+        Upload several json files to the dropbox and commit them in a single batch.
+
+        Args:
+            items: the content, the storage path, the file name without the .json
+                extension and whether an existing file may be overwritten for every
+                file that should be uploaded
+
+        Raises:
+            FileExistsError: If one of the files already exists and may not be
+                overwritten.
+            OSError: If one of the files could not be committed for another reason.
+        """
+        if not items:
+            return
+        payloads = [_dump_json(content_dict) for content_dict, _, _, _ in items]
+
+        # every file gets its own closed upload session. They are started in parallel.
+        def start_session(payload: bytes) -> str:
+            if len(payload) > _LARGE_UPLOAD_SIZE:
+                return self._start_large_session(payload)
+            return self._api_call(
+                "files_upload_session_start", payload, close=True
+            ).session_id
+
+        session_ids = list(_EXECUTOR.map(start_session, payloads))
+
+        full_paths = [
+            self._full_path(storage_path, job_id)
+            for _, storage_path, job_id, _ in items
+        ]
+        entries = [
+            UploadSessionFinishArg(
+                cursor=UploadSessionCursor(session_id=session_id, offset=len(payload)),
+                commit=CommitInfo(
+                    path=full_path,
+                    mode=WriteMode("overwrite" if overwrite else "add"),
+                    autorename=False,
+                ),
+            )
+            for session_id, payload, full_path, (_, _, _, overwrite) in zip(
+                session_ids, payloads, full_paths, items
+            )
+        ]
+        # larger batches are committed in several parts. All parts are committed
+        # before the failures are reported.
+        result_entries = []
+        for start in range(0, len(entries), _MAX_BATCH_SIZE):
+            batch_result = self._api_call(
+                "files_upload_session_finish_batch_v2",
+                entries[start : start + _MAX_BATCH_SIZE],
+            )
+            result_entries.extend(batch_result.entries)
+        for full_path, entry in zip(full_paths, result_entries):
+            if not entry.is_failure():
+                continue
+            failure = entry.get_failure()
+            if failure.is_path() and failure.get_path().is_conflict():
+                raise FileExistsError(
+                    f"The file {full_path} already exists and should not be overwritten."
+                )
+            raise OSError(f"Could not upload file under {full_path}: {failure}")
+
+    def _list_folder(self, folder_path: str, limit: Optional[int] = None) -> Iterator:
+        """
+        Iterate over the entries of a folder in the dropbox. The pages are only
+        requested from dropbox once the previous page was consumed.
+
+        Args:
+            folder_path: the path of the folder
+            limit: the maximal number of entries per page. None lets dropbox decide.
+
+        Yields:
+            The metadata of the entries in the folder.
+        """
+        # dropbox expects a leading and a trailing slash for the folder
+        folder_path = f"/{folder_path.strip('/')}/"
+        folders_results = self._api_call(
+            "files_list_folder", path=folder_path, limit=limit
+        )
+        yield from folders_results.entries
+        # we have too loop as dropbox somehow sometimes only returns a part of the files
+        while folders_results.has_more:
+            folders_results = self._api_call(
+                "files_list_folder_continue", folders_results.cursor
+            )
+            yield from folders_results.entries
 
     def delete_folder(self, folder_path: str) -> None:
         """
@@ -255,24 +547,9 @@ class DropboxCore(StorageCore):
             None
         """
 
-        # strip trailing and leading slashes from the storage_path
-        folder_path = folder_path.strip("/")
-
-        # Create an instance of a Dropbox class, which can make requests to the API.
-        with dropbox.Dropbox(
-            app_key=self.app_key,
-            app_secret=self.app_secret,
-            oauth2_refresh_token=self.refresh_token,
-        ) as dbx:
-            # Check that the access token is valid
-            try:
-                dbx.users_get_current_account()
-            except AuthError:
-                sys.exit("ERROR: Invalid access token.")
-
-            # to remove a folder there must be no trailing slash
-            full_path = "/" + folder_path
-            _ = dbx.files_delete_v2(path=full_path)
+        # to remove a folder there must be no trailing slash
+        full_path = f"/{folder_path.strip('/')}"
+        _ = self._api_call("files_delete_v2", path=full_path)
 
 
 class DropboxProviderExtended(StorageProvider, DropboxCore):
@@ -288,7 +565,8 @@ class DropboxProviderExtended(StorageProvider, DropboxCore):
         status_path: The path to the folder where the status is stored
         results_path: The path to the folder where the results are stored
         pks_path: The path to the folder where the public keys are stored
-
+        queue_page_size: The number of entries that `iter_file_queue` requests from
+            dropbox at once
     """
 
     configs_path: PathStr = "Backend_files/Config"
@@ -299,6 +577,7 @@ class DropboxProviderExtended(StorageProvider, DropboxCore):
     status_path: PathStr = "Backend_files/Status"
     results_path: PathStr = "Backend_files/Result"
     pks_path: PathStr = "Backend_files/public_keys"
+    queue_page_size: int = 1
 
     def get_attribute_path(
         self,
@@ -493,7 +772,7 @@ class DropboxProviderExtended(StorageProvider, DropboxCore):
 
     def update_in_database(
         self,
-        result_dict: ResultDict,
+        result_dict: Optional[ResultDict],
         status_msg_dict: StatusMsgDict,
         job_id: str,
         display_name: DisplayNameStr,
@@ -503,7 +782,8 @@ class DropboxProviderExtended(StorageProvider, DropboxCore):
         Upload the status and result to the dropbox.
 
         Args:
-            result_dict: the dictionary containing the result of the job
+            result_dict: the dictionary containing the result of the job. It may be None
+                if the job is not DONE, e.g. for the intermediate status updates.
             status_msg_dict: the dictionary containing the status message of the job
             job_id: the name of the job
             display_name: the name of the backend
@@ -524,35 +804,69 @@ class DropboxProviderExtended(StorageProvider, DropboxCore):
         job_json_name = self.get_attribute_id("job", job_id)
         job_json_start_dir = self.get_attribute_path("running")
 
+        def update_status() -> None:
+            try:
+                self.update(
+                    status_msg_dict.model_dump(), status_json_dir, status_json_name
+                )
+            except FileNotFoundError:
+                logging.warning(
+                    "The status file was missing for %s with job_id %s was missing.",
+                    display_name,
+                    job_id,
+                )
+                self.upload_status(
+                    display_name, username=extracted_username, job_id=job_id
+                )
+                self.update(
+                    status_msg_dict.model_dump(), status_json_dir, status_json_name
+                )
+
         if status_msg_dict.status == "DONE":
-            self.upload_result(
-                result_dict,
-                display_name,
-                job_id,
-                private_jwk,
-            )
+            # test if the result dict is None
+            if result_dict is None:
+                raise ValueError(
+                    "The 'result_dict' argument cannot be None if the job is done."
+                )
             # now move the job out of the running jobs into the finished jobs
             job_finished_json_dir = self.get_attribute_path(
                 "finished", display_name=display_name, username=extracted_username
             )
 
-            self.move(job_json_start_dir, job_finished_json_dir, job_json_name)
+            def move_job() -> None:
+                self.move(job_json_start_dir, job_finished_json_dir, job_json_name)
+
+            # the result and the status are committed together in one batch, such that
+            # the status never tells that the job is done without a result
+            result_payload = self._format_result_dict(
+                result_dict, display_name, job_id, private_jwk
+            )
+            result_json_dir = self.get_attribute_path("results", display_name, job_id)
+            result_json_name = self.get_attribute_id("results", job_id)
+            _run_parallel(
+                lambda: self._upload_batch(
+                    [
+                        (result_payload, result_json_dir, result_json_name, False),
+                        (
+                            status_msg_dict.model_dump(),
+                            status_json_dir,
+                            status_json_name,
+                            True,
+                        ),
+                    ]
+                ),
+                move_job,
+            )
 
         elif status_msg_dict.status == "ERROR":
             # because there was an error, we move the job to the deleted jobs
             deleted_json_dir = self.get_attribute_path("deleted", display_name)
-            self.move(job_json_start_dir, deleted_json_dir, job_json_name)
-
-        try:
-            self.update(status_msg_dict.model_dump(), status_json_dir, status_json_name)
-        except FileNotFoundError:
-            logging.warning(
-                "The status file was missing for %s with job_id %s was missing.",
-                display_name,
-                job_id,
+            _run_parallel(
+                lambda: self.move(job_json_start_dir, deleted_json_dir, job_json_name),
+                update_status,
             )
-            self.upload_status(display_name, username=extracted_username, job_id=job_id)
-            self.update(status_msg_dict.model_dump(), status_json_dir, status_json_name)
+        else:
+            update_status()
 
     def get_file_queue(self, storage_path: str) -> list[str]:
         """
@@ -565,96 +879,88 @@ class DropboxProviderExtended(StorageProvider, DropboxCore):
             A list of files that was found.
         """
 
-        # strip trailing and leading slashes from the paths
-        storage_path = storage_path.strip("/")
+        names: list[str] = []
+        # We should really handle these exceptions cleaner, but this seems a bit
+        # complicated right now
+        # pylint: disable=W0703
+        try:
+            names = list(self._iter_json_names(storage_path))
+        except StorageAuthError:
+            # the caller can try again later with a refreshed token
+            raise
+        except Exception as err:
+            print(err)
+        return names
 
-        storage_path = "/" + storage_path.strip("/") + "/"
+    def iter_file_queue(self, storage_path: str, page_size: int = 1) -> Iterator[str]:
+        """
+        Iterate over the json files in the folder. The listing is requested in pages of
+        `queue_page_size` entries or `page_size` if the caller needs more, so looking up
+        the next jobs does not list the whole queue.
 
-        # Create an instance of a Dropbox class, which can make requests to the API.
-        names: list[str] = []
-        with dropbox.Dropbox(
-            app_key=self.app_key,
-            app_secret=self.app_secret,
-            oauth2_refresh_token=self.refresh_token,
-        ) as dbx:
-            # Check that the access token is valid
-            try:
-                dbx.users_get_current_account()
-            except AuthError:
-                sys.exit("ERROR: Invalid access token.")
-            # We should really handle these exceptions cleaner, but this seems a bit
-            # complicated right now
-            # pylint: disable=W0703
+        Args:
+            storage_path: Where are we looking for the files.
+            page_size: The number of files that the caller needs at once.
+
+        Yields:
+            The names of the files that were found.
+        """
+        # dropbox does not return more than 2000 entries per page
+        limit = min(max(page_size, self.queue_page_size), 2000)
+        yield from self._iter_json_names(storage_path, limit=limit)
+
+    def _claim_jobs(
+        self, job_json_dir: str, running_path: str, job_json_names: list[str]
+    ) -> list[str]:
+        """
+        Claim the jobs by moving them into the running folder. The moves are
+        independent, so they are sent in parallel.
+
+        Args:
+            job_json_dir: The path of the queue
+            running_path: The path of the running jobs
+            job_json_names: The names of the jobs that should be claimed
+
+        Returns:
+            The names of the jobs that were claimed in the given order.
+        """
+
+        def claim(job_json_name: str) -> Optional[str]:
             try:
+                self.move(job_json_dir, running_path, job_json_name)
+            except FileNotFoundError:
+                logging.info("The job %s was already taken.", job_json_name)
+                return None
+            return job_json_name
 
-                # we have too loop as dropbox somehow sometimes only returns a part of the files
-                file_list = []  # collects all files here
-                has_more_files = True  # because we haven't queried yet
-                cursor = None  # because we haven't queried yet
-                while has_more_files:
-                    if cursor is None:  # if it is our first time querying
-                        folders_results = dbx.files_list_folder(storage_path)
-                    else:
-                        # we can ignore the mypy error that this is unreachable as the cursor is
-                        # set in the while loop
-                        folders_results = dbx.files_list_folder_continue(cursor)  # type: ignore
-                    file_list.extend(folders_results.entries)
-                    cursor = folders_results.cursor
-                    has_more_files = folders_results.has_more
-
-                file_list = [item.name for item in file_list]
-                json_files = [item for item in file_list if item.endswith(".json")]
-
-                # Get the backend names
-                names = [file_name.split(".")[0] for file_name in json_files]
-
-            except ApiError:
-                print(f"Could not obtain job queue for {storage_path}")
-            except Exception as err:
-                print(err)
-        return names
+        return [name for name in _EXECUTOR.map(claim, job_json_names) if name]
+
+    def _iter_json_names(
+        self, storage_path: str, limit: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Iterate over the names of the json files in the folder without the ending.
+
+        Args:
+            storage_path: Where are we looking for the files.
+            limit: the maximal number of entries per page. None lets dropbox decide.
+
+        Yields:
+            The names of the files that were found.
+        """
+        try:
+            for entry in self._list_folder(storage_path, limit=limit):
+                if entry.name.endswith(".json"):
+                    yield entry.name.split(".")[0]
+        except ApiError:
+            print(f"Could not obtain job queue for {storage_path}")
 
     @validate_active
     def get_backends(self) -> list[str]:
         """
         Get a list of all the backends that the provider offers.
         """
-
-        # strip possible trailing and leading slashes from the path
-        config_path = self.configs_path.strip("/")
-
-        # and now add them nicely
-        full_config_path = f"/{config_path}/"
-        with dropbox.Dropbox(
-            app_key=self.app_key,
-            app_secret=self.app_secret,
-            oauth2_refresh_token=self.refresh_token,
-        ) as dbx:
-            # Check that the access token is valid
-            try:
-                dbx.users_get_current_account()
-            except AuthError:
-                sys.exit("ERROR: Invalid access token.")
-
-            # we have too loop as dropbox somehow sometimes only returns a part of the files
-            file_list = []  # collects all files here
-            has_more_files = True  # because we haven't queried yet
-            cursor = None  # because we haven't queried yet
-            while has_more_files:
-                if cursor is None:  # if it is our first time querying
-                    folders_results = dbx.files_list_folder(path=full_config_path)
-                else:
-                    # we can ignore the mypy error that this is unreachable as the cursor is
-                    # set in the while loop
-                    folders_results = dbx.files_list_folder_continue(cursor)  # type: ignore
-                file_list.extend(folders_results.entries)
-                cursor = folders_results.cursor
-                has_more_files = folders_results.has_more
-
-            backend_names = []
-            for entry in file_list:
-                backend_names.append(entry.name)
-        return backend_names
+        return [entry.name for entry in self._list_folder(self.configs_path)]
 
     def get_config(self, display_name: DisplayNameStr) -> BackendConfigSchemaIn:
         """
@@ -7,7 +7,7 @@ import logging
 import os
 import shutil
 import uuid
-from typing import Mapping, Optional
+from typing import Iterator, Mapping, Optional
 
 from pathvalidate import validate_filename
 
@@ -49,6 +49,28 @@ class LocalCore(StorageCore):
         super().__init__(name, is_active)
         self.base_path = login_dict.base_path
 
+        # the resolved folders of the storage paths, such that they are only joined once
+        self._resolved_paths: dict[str, str] = {}
+
+    def _resolve_path(self, storage_path: str) -> str:
+        """
+        Get the resolved folder for the `storage_path`. It is only computed the first
+        time that the path is used.
+
+        Args:
+            storage_path: The path to the folder relative to the `base_path`
+
+        Returns:
+            The resolved path to the folder.
+        """
+        folder_path = self._resolved_paths.get(storage_path)
+        if folder_path is None:
+            folder_path = os.path.normpath(
+                os.path.join(self.base_path, storage_path.strip("/"))
+            )
+            self._resolved_paths[storage_path] = folder_path
+        return folder_path
+
     @validate_active
     def upload(self, content_dict: Mapping, storage_path: str, job_id: str) -> None:
         """
@@ -59,46 +81,40 @@ class LocalCore(StorageCore):
             storage_path: The path to the file
             job_id: The id of the job
         """
-        # strip trailing and leading slashes from the storage_path
-        storage_path = storage_path.strip("/")
-
         # json folder
-        folder_path = self.base_path + "/" + storage_path
+        folder_path = self._resolve_path(storage_path)
         if not os.path.exists(folder_path):
             os.makedirs(folder_path)
 
         # create the full path
-        file_name = job_id + ".json"
-        full_json_path = os.path.join(folder_path, file_name)
-        secure_path = os.path.normpath(full_json_path)
-        # test if the file already exists and raise a warning if it does
-        if os.path.exists(secure_path):
+        secure_path = os.path.normpath(os.path.join(folder_path, job_id + ".json"))
+        # serialize before opening such that a failure does not leave an empty file
+        json_str = json.dumps(content_dict, default=datetime_handler)
+        # the exclusive mode lets the open itself fail if the file already exists
+        try:
+            with open(secure_path, "x", encoding="utf-8") as json_file:
+                json_file.write(json_str)
+        except FileExistsError as err:
             raise FileExistsError(
                 f"The file {secure_path} already exists and should not be overwritten."
-            )
-        with open(secure_path, "w", encoding="utf-8") as json_file:
-            json.dump(content_dict, json_file, default=datetime_handler)
+            ) from err
 
     @validate_active
     def get(self, storage_path: str, job_id: str) -> dict:
         """
         Get the file content from the storage
         """
-        # strip trailing and leading slashes from the storage_path
-        storage_path = storage_path.strip("/")
-
         # create the full path
-        file_name = job_id + ".json"
-        full_json_path = os.path.join(self.base_path, storage_path, file_name)
-        secure_path = os.path.normpath(full_json_path)
+        folder_path = self._resolve_path(storage_path)
+        secure_path = os.path.normpath(os.path.join(folder_path, job_id + ".json"))
 
-        # does the file already exist ?
-        if not os.path.exists(secure_path):
+        try:
+            with open(secure_path, "r", encoding="utf-8") as json_file:
+                loaded_data_dict = json.loads(json_file.read())
+        except FileNotFoundError as err:
             raise FileNotFoundError(
                 f"The file {secure_path} does not exist and cannot be loaded."
-            )
-        with open(secure_path, "r", encoding="utf-8") as json_file:
-            loaded_data_dict = json.load(json_file)
+            ) from err
         return loaded_data_dict
 
     @validate_active
@@ -117,37 +133,34 @@ class LocalCore(StorageCore):
         Raises:
             FileNotFoundError: If the file is not found
         """
-        # strip trailing and leading slashes from the storage_path
-        storage_path = storage_path.strip("/")
-
         # json folder
-        file_name = job_id + ".json"
-        full_json_path = os.path.join(self.base_path, storage_path, file_name)
-        secure_path = os.path.normpath(full_json_path)
+        folder_path = self._resolve_path(storage_path)
+        secure_path = os.path.normpath(os.path.join(folder_path, job_id + ".json"))
 
-        # does the file already exist ?
-        if not os.path.exists(secure_path):
+        json_str = json.dumps(content_dict, default=datetime_handler)
+        # opening without O_CREAT fails by itself if the file does not exist yet
+        try:
+            file_descriptor = os.open(secure_path, os.O_WRONLY | os.O_TRUNC)
+        except FileNotFoundError as err:
             raise FileNotFoundError(
                 f"The file {secure_path} does not exist and cannot be updated."
-            )
-        with open(secure_path, "w", encoding="utf-8") as json_file:
-            json.dump(content_dict, json_file, default=datetime_handler)
+            ) from err
+        with open(file_descriptor, "w", encoding="utf-8") as json_file:
+            json_file.write(json_str)
 
     @validate_active
     def move(self, start_path: str, final_path: str, job_id: str) -> None:
         """
         Move the file from `start_path` to `final_path`
         """
-        start_path = start_path.strip("/")
-
-        source_file = self.base_path + "/" + start_path + "/" + job_id + ".json"
+        source_file = os.path.join(self._resolve_path(start_path), job_id + ".json")
 
-        final_path = self.base_path + "/" + final_path + "/"
-        if not os.path.exists(final_path):
-            os.makedirs(final_path)
+        final_dir = self._resolve_path(final_path)
+        if not os.path.exists(final_dir):
+            os.makedirs(final_dir)
 
         # Move the file
-        shutil.move(source_file, final_path)
+        shutil.move(source_file, final_dir)
 
     @validate_active
     def delete(self, storage_path: str, job_id: str) -> None:
@@ -164,8 +177,7 @@ class LocalCore(StorageCore):
         Returns:
             None
         """
-        storage_path = storage_path.strip("/")
-        source_file = self.base_path + "/" + storage_path + "/" + job_id + ".json"
+        source_file = os.path.join(self._resolve_path(storage_path), job_id + ".json")
         os.remove(source_file)
 
 
@@ -272,6 +284,25 @@ class LocalProviderExtended(StorageProvider, LocalCore):
         """
         return self.get_file_queue(self.configs_path)
 
+    def register_backend_paths(self, display_name: DisplayNameStr) -> None:
+        """
+        Register the folders that are used for every job of the backend, such that
+        they only have to be resolved once.
+
+        Args:
+            display_name: The name of the backend
+        """
+        attribute_names: tuple[AttributePathStr, ...] = (
+            "queue",
+            "running",
+            "status",
+            "results",
+            "finished",
+            "deleted",
+        )
+        for attribute_name in attribute_names:
+            self._resolve_path(self.get_attribute_path(attribute_name, display_name))
+
     def create_job_id(self, display_name: DisplayNameStr, username: str) -> str:
         """
         Create a job id for the job.
@@ -343,8 +374,7 @@ class LocalProviderExtended(StorageProvider, LocalCore):
 
         config_dict = self._verify_config(config_dict, display_name)
         # path of the configs
-        config_path = os.path.join(self.base_path, self.configs_path)
-        config_path = os.path.normpath(config_path)
+        config_path = self._resolve_path(self.configs_path)
 
         file_name = display_name + ".json"
         full_json_path = os.path.join(config_path, file_name)
@@ -438,8 +468,7 @@ class LocalProviderExtended(StorageProvider, LocalCore):
 
         # path of the public keys
         pks_path = self.get_attribute_path("pks")
-        key_path = os.path.join(self.base_path, pks_path)
-        key_path = os.path.normpath(key_path)
+        key_path = self._resolve_path(pks_path)
 
         # test if the key path already exists. If it does not, create it
         if not os.path.exists(key_path):
@@ -463,7 +492,7 @@ class LocalProviderExtended(StorageProvider, LocalCore):
             JWk : The public JWK object
         """
         pks_path = self.get_attribute_path("pks")
-        key_path = os.path.join(self.base_path, pks_path)
+        key_path = self._resolve_path(pks_path)
         file_name = f"{kid}.json"
 
         validate_filename(file_name)
@@ -496,7 +525,7 @@ class LocalProviderExtended(StorageProvider, LocalCore):
 
     def update_in_database(
         self,
-        result_dict: ResultDict,
+        result_dict: Optional[ResultDict],
         status_msg_dict: StatusMsgDict,
         job_id: str,
         display_name: DisplayNameStr,
@@ -506,7 +535,8 @@ class LocalProviderExtended(StorageProvider, LocalCore):
         Upload the status and result to the `StorageProvider`.
 
         Args:
-            result_dict: the dictionary containing the result of the job
+            result_dict: the dictionary containing the result of the job. It may be None
+                if the job is not DONE, e.g. for the intermediate status updates.
             status_msg_dict: the dictionary containing the status message of the job
             job_id: the name of the job
             display_name: the name of the backend
@@ -578,20 +608,29 @@ class LocalProviderExtended(StorageProvider, LocalCore):
         Returns:
             A list of files that was found.
         """
-        # get a list of files in the folder
-        full_path = self.base_path + "/" + storage_path
-        # test if the path exists. Otherwise simply return an empty list
-        if not os.path.exists(full_path):
-            return []
+        return list(self.iter_file_queue(storage_path))
 
-        all_items = os.listdir(full_path)
-        # Filter out only the JSON files
-        json_files = [item for item in all_items if item.endswith(".json")]
+    def iter_file_queue(self, storage_path: str, page_size: int = 1) -> Iterator[str]:
+        """
+        Iterate over the json files in the folder without listing the whole folder
+        first. The ending of the file is removed.
 
-        # Get the backend names
-        names = [os.path.splitext(file_name)[0] for file_name in json_files]
+        Args:
+            storage_path: Where are we looking for the files.
+            page_size: Not needed, as the folder is read entry by entry.
 
-        return names
+        Yields:
+            The names of the files that were found.
+        """
+        full_path = self._resolve_path(storage_path)
+        # test if the path exists. Otherwise there is simply nothing to iterate over
+        try:
+            with os.scandir(full_path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json"):
+                        yield entry.name[: -len(".json")]
+        except FileNotFoundError:
+            pass
 
 
 class LocalProvider(LocalProviderExtended):
@@ -3,16 +3,17 @@ The module that contains all the necessary logic for communication with the Mong
 """
 
 import logging
-import uuid
+import threading
 from datetime import timezone
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, Mapping, Optional, Sequence
 
 from bson.codec_options import CodecOptions
 from bson.errors import InvalidId
 from bson.objectid import ObjectId
 from pymongo.collection import Collection
 from pymongo.database import Database
-from pymongo.errors import DuplicateKeyError
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
 
 # necessary for the mongodb provider
 from pymongo.mongo_client import MongoClient
@@ -23,6 +24,7 @@ from ..schemes import (
     BackendConfigSchemaIn,
     DisplayNameStr,
     MongodbLoginInformation,
+    NextJobSchema,
     PathStr,
     PksStr,
     ResultDict,
@@ -31,6 +33,54 @@ from ..schemes import (
 from ..security import JWK
 from .base import StorageCore, StorageProvider, validate_active
 
+# one client and hence one connection pool per uri, which is shared by all providers
+_MONGO_CLIENTS: dict[str, MongoClient] = {}
+_MONGO_CLIENTS_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=4096)
+def _object_id(job_id: str) -> ObjectId:
+    """
+    Get the ObjectId of a job. The same job is looked up several times during its
+    lifetime, so the parsed ids are cached.
+
+    Args:
+        job_id: The hex string of the id
+
+    Raises:
+        InvalidId: If the job_id is not a valid ObjectId
+
+    Returns:
+        The ObjectId of the job.
+    """
+    return ObjectId(job_id)
+
+
+def _get_client(uri: str) -> MongoClient:
+    """
+    Get the shared client for the uri. It is created on the first call and connects
+    lazily on the first operation.
+
+    Args:
+        uri: The uri of the mongodb
+
+    Returns:
+        The client that is shared by all the providers with the same uri.
+    """
+    with _MONGO_CLIENTS_LOCK:
+        client = _MONGO_CLIENTS.get(uri)
+        if client is None:
+            # zlib is the only wire compression that needs no extra dependency. The
+            # server falls back to uncompressed messages if it does not support it.
+            client = _MONGO_CLIENTS[uri] = MongoClient(
+                uri,
+                maxPoolSize=50,
+                serverSelectionTimeoutMS=10000,
+                compressors="zlib",
+                zlibCompressionLevel=3,
+            )
+    return client
+
 
 class MongodbCore(StorageCore):
     """
@@ -60,11 +110,11 @@ class MongodbCore(StorageCore):
 
         uri = f"mongodb+srv://{mongodb_username}:{mongodb_password}@{mongodb_database_url}"
         uri = uri + "/?retryWrites=true&w=majority"
-        # Create a new client and connect to the server
-        self.client: MongoClient = MongoClient(uri)
+        # the client is shared and only connects to the server on the first operation
+        self.client: MongoClient = _get_client(uri)
 
-        # Send a ping to confirm a successful connection
-        self.client.admin.command("ping")
+        # the handles are lightweight and safe to reuse, so they are created once per path
+        self._collections: dict[str, tuple[Database, Collection]] = {}
 
     @validate_active
     def upload(self, content_dict: dict, storage_path: str, job_id: str) -> None:
@@ -78,7 +128,7 @@ class MongodbCore(StorageCore):
 
         _, collection = self._get_database_and_collection(storage_path)
 
-        content_dict["_id"] = ObjectId(job_id)
+        content_dict["_id"] = _object_id(job_id)
 
         try:
             collection.insert_one(content_dict)
@@ -89,6 +139,45 @@ class MongodbCore(StorageCore):
         # remove the id from the content dict for further use
         content_dict.pop("_id", None)
 
+    @validate_active
+    def upload_many(self, items: Sequence[tuple[Mapping, str, str]]) -> None:
+        """
+        Upload several files to the storage. The files of every collection are
+        inserted with a single unordered `insert_many`, so the server can write them
+        in any order and continues past a single failure.
+
+        Args:
+            items: the content, the storage path and the id of every file that should
+                be uploaded
+
+        Raises:
+            FileExistsError: If some of the files already exist. It is raised once all
+                the other files were uploaded, also those of the other collections.
+            BulkWriteError: If the upload failed for any other reason.
+        """
+        documents_per_path: dict[str, list[dict]] = {}
+        for content_dict, storage_path, job_id in items:
+            documents_per_path.setdefault(storage_path, []).append(
+                {**content_dict, "_id": _object_id(job_id)}
+            )
+
+        # the duplicates are only reported once all collections were written
+        existing_files: list[str] = []
+        for storage_path, documents in documents_per_path.items():
+            _, collection = self._get_database_and_collection(storage_path)
+            try:
+                collection.insert_many(documents, ordered=False)
+            except BulkWriteError as err:
+                write_errors = err.details.get("writeErrors", [])
+                # 11000 is the code of a duplicate key
+                if any(error["code"] != 11000 for error in write_errors):
+                    raise
+                existing_files.extend(
+                    f"{storage_path}/{error['op']['_id']}" for error in write_errors
+                )
+        if existing_files:
+            raise FileExistsError(f"The files {existing_files} already exist.")
+
     @validate_active
     def get(self, storage_path: str, job_id: str) -> dict:
         """
@@ -102,25 +191,21 @@ class MongodbCore(StorageCore):
             The content of the file
         """
         try:
-            document_to_find = {"_id": ObjectId(job_id)}
+            document_to_find = {"_id": _object_id(job_id)}
         except InvalidId as err:
             raise FileNotFoundError(
                 f"The job_id {job_id} is not valid. Please check the job_id."
             ) from err
 
-        document_to_find = {"_id": ObjectId(job_id)}
-
         _, collection = self._get_database_and_collection(storage_path)
 
-        result_found = collection.find_one(document_to_find)
+        # the id is not part of the content, so the server leaves it out
+        result_found = collection.find_one(document_to_find, {"_id": 0})
 
-        if not result_found:
+        if result_found is None:
             raise FileNotFoundError(
                 f"Could not find a file under {storage_path} with the id {job_id}."
             )
-
-        # remove the id from the result dict for further use
-        result_found.pop("_id", None)
         return result_found
 
     @validate_active
@@ -143,7 +228,7 @@ class MongodbCore(StorageCore):
 
         _, collection = self._get_database_and_collection(storage_path)
 
-        filter_dict = {"_id": ObjectId(job_id)}
+        filter_dict = {"_id": _object_id(job_id)}
         result = collection.replace_one(filter_dict, content_dict)
 
         if result.matched_count == 0:
@@ -160,20 +245,38 @@ class MongodbCore(StorageCore):
 
         Returns:
             None
-        """
-
-        # delete the old file
-        _, collection = self._get_database_and_collection(start_path)
-
-        document_to_find = {"_id": ObjectId(job_id)}
-        result_found = collection.find_one(document_to_find)
-
-        collection.delete_one(document_to_find)
-
-        # add the document to the new collection
-        _, collection = self._get_database_and_collection(final_path)
 
-        collection.insert_one(result_found)
+        Raises:
+            FileNotFoundError: If the file is not found under start_path
+        """
+
+        _, start_collection = self._get_database_and_collection(start_path)
+        final_database, final_collection = self._get_database_and_collection(final_path)
+
+        document_to_find = {"_id": _object_id(job_id)}
+
+        # the server copies the document into the new collection, so it never has to
+        # travel through the client. The old document is only deleted afterwards, such
+        # that an interruption never loses the job.
+        start_collection.aggregate(
+            [
+                {"$match": document_to_find},
+                {
+                    "$merge": {
+                        "into": {
+                            "db": final_database.name,
+                            "coll": final_collection.name,
+                        },
+                        "whenMatched": "replace",
+                    }
+                },
+            ]
+        )
+        result = start_collection.delete_one(document_to_find)
+        if result.deleted_count == 0:
+            raise FileNotFoundError(
+                f"Could not find a file under {start_path} with the id {job_id}."
+            )
 
     @validate_active
     def delete(self, storage_path: str, job_id: str) -> None:
@@ -190,7 +293,7 @@ class MongodbCore(StorageCore):
         _, collection = self._get_database_and_collection(storage_path)
 
         try:
-            document_to_find = {"_id": ObjectId(job_id)}
+            document_to_find = {"_id": _object_id(job_id)}
         except InvalidId as err:
             raise FileNotFoundError(
                 f"The job_id {job_id} is not valid. Please check the job_id."
@@ -213,16 +316,14 @@ class MongodbCore(StorageCore):
         Returns:
             The database and the collection on which we work
         """
-        # strip the path from leading and trailing slashes
-        storage_path = storage_path.strip("/")
-
-        # get the database on which we work
-        database = self.client[storage_path.split("/")[0]]
-
-        # get the collection on which we work
-        collection_name = ".".join(storage_path.split("/")[1:])
-        collection = database[collection_name]
-        return database, collection
+        handles = self._collections.get(storage_path)
+        if handles is None:
+            # the first part of the path is the database and the rest the collection
+            database_name, _, collection_path = storage_path.strip("/").partition("/")
+            database = self.client[database_name]
+            collection = database[collection_path.replace("/", ".")]
+            handles = self._collections[storage_path] = (database, collection)
+        return handles
 
 
 class MongodbProviderExtended(StorageProvider, MongodbCore):
@@ -238,6 +339,8 @@ class MongodbProviderExtended(StorageProvider, MongodbCore):
         status_path: The path to the folder where the status is stored
         results_path: The path to the folder where the results are stored
         pks_path: The path to the folder where the public keys are stored
+        queue_page_size: The number of ids that `iter_file_queue` requests from the
+            mongodb at once
     """
 
     configs_path: PathStr = "backends/configs"
@@ -248,6 +351,7 @@ class MongodbProviderExtended(StorageProvider, MongodbCore):
     status_path: PathStr = "status"
     results_path: PathStr = "results"
     pks_path: PathStr = "backends/public_keys"
+    queue_page_size: int = 10
 
     def get_attribute_path(
         self,
@@ -330,17 +434,40 @@ class MongodbProviderExtended(StorageProvider, MongodbCore):
         # get the collection on which we work
         _, config_collection = self._get_database_and_collection(self.configs_path)
 
-        # get all the documents in the collection configs and save the disply_name in a list
+        # get all the documents in the collection configs and save the disply_name in a
+        # list. Only the names are transferred and not the complete configurations.
         backend_names: list[DisplayNameStr] = []
-        for config_dict in config_collection.find():
-            config_dict.pop("_id")
-            expected_keys_for_jws = {"header", "payload", "signature"}
-            if set(config_dict.keys()) == expected_keys_for_jws:
-                backend_names.append(config_dict["payload"]["display_name"])
-            else:
+        for config_dict in config_collection.find(
+            {}, {"_id": 0, "display_name": 1, "payload.display_name": 1}
+        ):
+            if "display_name" in config_dict:
                 backend_names.append(config_dict["display_name"])
+            else:
+                backend_names.append(config_dict["payload"]["display_name"])
         return backend_names
 
+    def register_backend_paths(self, display_name: DisplayNameStr) -> None:
+        """
+        Look up the collections that are used for every job of the backend, such that
+        their handles are cached before the first job arrives.
+
+        Args:
+            display_name: The name of the backend
+        """
+        attribute_names: tuple[AttributePathStr, ...] = (
+            "queue",
+            "running",
+            "status",
+            "results",
+            "finished",
+            "deleted",
+        )
+        for attribute_name in attribute_names:
+            self._get_database_and_collection(
+                self.get_attribute_path(attribute_name, display_name)
+            )
+
+    @validate_active
     def upload_config(
         self,
         config_dict: BackendConfigSchemaIn,
@@ -360,31 +487,19 @@ class MongodbProviderExtended(StorageProvider, MongodbCore):
         """
         config_dict = self._verify_config(config_dict, display_name)
 
-        # first we have to check if the device already exists in the database
-
-        document_to_find = {"display_name": display_name}
-
         # get the collection on which we work
         _, collection = self._get_database_and_collection(self.configs_path)
 
-        document_to_find = {"display_name": display_name}
-        result_found = collection.find_one(document_to_find)
-        if result_found:
-            raise FileExistsError(
-                f"The configuration for {display_name} already exists and should not be overwritten."
-            )
-
-        # now also look for signed configurations
-        signed_document_to_find = {"payload.display_name": display_name}
-        result_found = collection.find_one(signed_document_to_find)
-        if result_found:
+        # first we have to check if the device already exists in the database, signed
+        # or not
+        if self._find_config_document(collection, display_name):
             raise FileExistsError(
                 f"The configuration for {display_name} already exists and should not be overwritten."
             )
 
         upload_dict = self._format_config_dict(config_dict, private_jwk)
-        config_id = uuid.uuid4().hex[:24]
-        self.upload(upload_dict, self.configs_path, config_id)
+        # nobody looks up the configuration by its id, so the driver can create it
+        collection.insert_one(upload_dict)
 
     def update_config(
         self,
@@ -413,28 +528,19 @@ class MongodbProviderExtended(StorageProvider, MongodbCore):
             codec_options=CodecOptions(tz_aware=True, tzinfo=timezone.utc)
         )
         # first we have to check if the device already exists in the database
-        document_to_find = {"display_name": display_name}
-        result_found = collection_with_tz.find_one(document_to_find)
+        old_config_jws = self._find_config_document(collection_with_tz, display_name)
 
-        signed_document_to_find = {"payload.display_name": display_name}
-        signed_backend_config_dict = collection_with_tz.find_one(
-            signed_document_to_find
-        )
-
-        if result_found:
-            old_config_jws = result_found
-            job_id = result_found["_id"]
-        elif signed_backend_config_dict:
-            old_config_jws = signed_backend_config_dict
-            job_id = signed_backend_config_dict["_id"]
-            old_config_jws.pop("_id")
-        else:
+        if old_config_jws is None:
             raise FileNotFoundError(
                 (
                     f"The config for {display_name} does not exist and should not be updated."
                     "Use the upload_config method instead."
                 )
             )
+        job_id = old_config_jws["_id"]
+        if "display_name" not in old_config_jws:
+            # the signed configuration should not contain the id
+            old_config_jws.pop("_id")
         upload_dict = self._format_update_config(
             old_config_jws, config_dict, private_jwk
         )
@@ -462,25 +568,50 @@ class MongodbProviderExtended(StorageProvider, MongodbCore):
         # get the collection on which we work
         _, config_collection = self._get_database_and_collection(self.configs_path)
 
-        # create the filter for the document with display_name that is equal to display_name
-        document_to_find = {"display_name": display_name}
-        backend_config_dict = config_collection.find_one(document_to_find)
-
-        signed_document_to_find = {"payload.display_name": display_name}
-        signed_backend_config_dict = config_collection.find_one(signed_document_to_find)
+        backend_config_dict = self._find_config_document(
+            config_collection, display_name
+        )
+        if backend_config_dict is None:
+            raise FileNotFoundError("The backend does not exist for the given storage.")
 
         # work with the unsigned backend
-        if backend_config_dict:
+        if "display_name" in backend_config_dict:
             backend_config_dict.pop("_id")
             return BackendConfigSchemaIn(**backend_config_dict)
 
-        # work with the signed backend this is working normally due to the mongodb API, but to make
-        # mypy happy, we have to check if the signed_backend_config_dict is not None
-        elif signed_backend_config_dict:
-            payload = signed_backend_config_dict["payload"]
-            return BackendConfigSchemaIn(**payload)
+        # work with the signed backend
+        return BackendConfigSchemaIn(**backend_config_dict["payload"])
 
-        raise FileNotFoundError("The backend does not exist for the given storage.")
+    def _find_config_document(
+        self, collection: Collection, display_name: DisplayNameStr
+    ) -> Optional[dict]:
+        """
+        Find the configuration document of the backend in a single query, no matter if
+        it is signed or not.
+
+        Args:
+            collection: The collection of the configurations
+            display_name: The name of the backend
+
+        Returns:
+            The document of the configuration or None if it does not exist. If there is
+            an unsigned and a signed configuration, the unsigned one is returned.
+        """
+        documents = list(
+            collection.find(
+                {
+                    "$or": [
+                        {"display_name": display_name},
+                        {"payload.display_name": display_name},
+                    ]
+                },
+                limit=2,
+            )
+        )
+        for document in documents:
+            if "display_name" in document:
+                return document
+        return documents[0] if documents else None
 
     def _delete_config(self, display_name: DisplayNameStr) -> bool:
         """
@@ -513,12 +644,13 @@ class MongodbProviderExtended(StorageProvider, MongodbCore):
 
     def create_job_id(self, display_name: DisplayNameStr, username: str) -> str:
         """
-        Create a job id for the job.
+        Create a job id for the job. The ids of mongodb grow with the time of their
+        creation, such that the jobs are inserted in order.
 
         Returns:
             The job id
         """
-        return (uuid.uuid4().hex)[:24]
+        return str(ObjectId())
 
     def _delete_status(
         self, display_name: DisplayNameStr, username: str, job_id: str
@@ -562,6 +694,7 @@ class MongodbProviderExtended(StorageProvider, MongodbCore):
         self.delete(storage_path=result_json_dir, job_id=job_id)
         return True
 
+    @validate_active
     def upload_public_key(
         self, public_jwk: JWK, display_name: DisplayNameStr, role: PksStr = "backend"
     ) -> None:
@@ -610,9 +743,9 @@ class MongodbProviderExtended(StorageProvider, MongodbCore):
         if role == "user":
             self.upload(public_jwk.model_dump(), pks_path, display_name)
         else:
-            # if the public key does not exist, we have to create it
-            config_id = uuid.uuid4().hex[:24]
-            self.upload(public_jwk.model_dump(), pks_path, config_id)
+            # if the public key does not exist, we have to create it. It is looked up
+            # by its kid, so the driver can create the id.
+            collection.insert_one(public_jwk.model_dump())
 
     def get_public_key_from_kid(self, kid: str) -> JWK:
         """
@@ -630,12 +763,10 @@ class MongodbProviderExtended(StorageProvider, MongodbCore):
 
         # create the filter for the document with display_name that is equal to display_name
         document_to_find = {"kid": kid}
-        public_jwk_dict = collection.find_one(document_to_find)
+        public_jwk_dict = collection.find_one(document_to_find, {"_id": 0})
 
         if not public_jwk_dict:
             raise FileNotFoundError("The backend does not exist for the given storage.")
-
-        public_jwk_dict.pop("_id")
         return JWK(**public_jwk_dict)
 
     def _delete_public_key(self, kid: str) -> bool:
@@ -678,7 +809,8 @@ class MongodbProviderExtended(StorageProvider, MongodbCore):
         status json file.
 
         Args:
-            result_dict: the dictionary containing the result of the job
+            result_dict: the dictionary containing the result of the job. It may be None
+                if the job is not DONE, e.g. for the intermediate status updates.
             status_msg_dict: the dictionary containing the status message of the job
             job_id: the name of the job
             display_name: the name of the backend
@@ -718,19 +850,69 @@ class MongodbProviderExtended(StorageProvider, MongodbCore):
 
         # TODO: most likely we should raise an error if the status of the job is not DONE or ERROR
 
-        # and create the status json file
+        # and create the status json file. The upsert creates a missing status in the
+        # same round trip.
         status_json_dir = self.get_attribute_path("status", display_name)
-
-        try:
-            self.update(status_msg_dict.model_dump(), status_json_dir, job_id)
-        except FileNotFoundError:
+        _, status_collection = self._get_database_and_collection(status_json_dir)
+        result = status_collection.replace_one(
+            {"_id": _object_id(job_id)}, status_msg_dict.model_dump(), upsert=True
+        )
+        if result.upserted_id is not None:
             logging.warning(
                 "The status file was missing for %s with job_id %s was missing.",
                 display_name,
                 job_id,
             )
-            self.upload_status(display_name, "", job_id)
-            self.update(status_msg_dict.model_dump(), status_json_dir, job_id)
+
+    def get_next_jobs_in_queue(
+        self,
+        display_name: DisplayNameStr,
+        n_jobs: int,
+        private_jwk: Optional[JWK] = None,
+    ) -> list[NextJobSchema]:
+        """
+        A function that claims up to `n_jobs` jobs from the queue at once. Every job
+        is taken out of the queue with a single `find_one_and_delete`, such that two
+        workers can never claim the same job, and is then written into the running jobs.
+
+        Args:
+            display_name: The name of the backend
+            n_jobs: The maximal number of jobs that should be claimed
+            private_jwk: The private JWK to sign the job with
+
+        Returns:
+            The claimed jobs in the order of the queue. It is empty if the queue is empty.
+
+        Raises:
+            PyMongoError: If the job could not be written into the running jobs. The
+                job is put back into the queue in this case.
+        """
+        queue_path = self.get_attribute_path("queue", display_name)
+
+        # time stamp when we last looked for a job
+        self.timestamp_queue(display_name, private_jwk)
+
+        running_path = self.get_attribute_path("running")
+        _, queue_collection = self._get_database_and_collection(queue_path)
+        _, running_collection = self._get_database_and_collection(running_path)
+        next_jobs: list[NextJobSchema] = []
+        while len(next_jobs) < n_jobs:
+            # the ids grow with the time of creation, so the oldest job comes first
+            job_document = queue_collection.find_one_and_delete({}, sort=[("_id", 1)])
+            if job_document is None:
+                break
+            try:
+                running_collection.insert_one(job_document)
+            except PyMongoError:
+                # put the job back, such that it is not lost
+                queue_collection.insert_one(job_document)
+                raise
+            next_jobs.append(
+                NextJobSchema(
+                    job_id=str(job_document["_id"]), job_json_path=running_path
+                )
+            )
+        return next_jobs
 
     def get_file_queue(self, storage_path: str) -> list[str]:
         """
@@ -745,12 +927,30 @@ class MongodbProviderExtended(StorageProvider, MongodbCore):
 
         _, collection = self._get_database_and_collection(storage_path)
 
-        # now get the id of all the documents in the collection
-        results = collection.find({}, {"_id": 1})
-        file_list = []
-        for result in results:
-            file_list.append(str(result["_id"]))
-        return file_list
+        # now get the id of all the documents in the collection. Only the ids are
+        # transferred, so large batches keep the number of round trips small.
+        results = collection.find({}, {"_id": 1}, batch_size=1000)
+        return [str(result["_id"]) for result in results]
+
+    def iter_file_queue(self, storage_path: str, page_size: int = 1) -> Iterator[str]:
+        """
+        Iterate over the documents in the collection of the queued jobs. The ids are
+        requested in batches of `queue_page_size` documents or `page_size` if the
+        caller needs more, so looking up the next jobs does not read the whole queue.
+
+        Args:
+            storage_path: Where are we looking for the files.
+            page_size: The number of files that the caller needs at once.
+
+        Yields:
+            The ids of the documents that were found.
+        """
+        _, collection = self._get_database_and_collection(storage_path)
+        with collection.find(
+            {}, {"_id": 1}, batch_size=max(page_size, self.queue_page_size)
+        ) as results:
+            for result in results:
+                yield str(result["_id"])
 
 
 class MongodbProvider(MongodbProviderExtended):
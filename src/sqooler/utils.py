@@ -7,7 +7,6 @@ import logging
 import time
 import traceback
 import uuid
-from typing import Tuple
 
 import regex as re
 from decouple import config
@@ -21,7 +20,7 @@ from .schemes import (
 )
 from .security import public_from_private_jwk
 from .spoolers import Spooler
-from .storage_providers.base import StorageProvider
+from .storage_providers.base import StorageAuthError, StorageProvider
 
 
 def update_backends(
@@ -65,6 +64,9 @@ def update_backends(
                 backend_config_dict, requested_backend, private_jwk
             )
 
+        # the paths are used for every job, so we prepare them only once
+        storage_provider.register_backend_paths(requested_backend)
+
         if spooler.sign:
             # this line is IMHO needless but somehow mypy thinks that it could be a
             # None (no idea how this could happen)
@@ -93,8 +95,7 @@ def main(
     backends_list = list(backends.keys())
     # set the appropiate display names for all the back-ends
     for requested_backend, spooler in backends.items():
-        # the content
-        spooler.display_name = requested_backend
+        spooler.configure(display_name=requested_backend)
 
     counter = 0
     # loop which is looking for the jobs
@@ -123,6 +124,10 @@ def main(
                 extra={"error_message": val_err.errors()},
             )
             job_dict = NextJobSchema(job_id="None", job_json_path="None")
+        except StorageAuthError:
+            # the token is refreshed on the next call, so there is no need to restart
+            logging.exception("Could not authenticate with the storage.")
+            job_dict = NextJobSchema(job_id="None", job_json_path="None")
 
         if job_dict.job_json_path == "None":
             counter += 1
@@ -192,7 +197,7 @@ def run_json_circuit(json_dict: dict, job_id: str, spooler: Spooler) -> dict:
     return result_dict.model_dump()
 
 
-def get_dummy_config(sign: bool = True) -> Tuple[str, BackendConfigSchemaIn]:
+def get_dummy_config(sign: bool = True) -> tuple[str, BackendConfigSchemaIn]:
     """
     Generate the dummy config of the fermion type.
 
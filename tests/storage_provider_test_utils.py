@@ -3,14 +3,16 @@ This module contains the test utils for the storage providers. So it is called b
 """
 
 import sys
+import time
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Tuple, Type
+from typing import Any, Type
 
 import dropbox
 import pytest
 from decouple import config
-from dropbox.exceptions import ApiError, AuthError
+from dropbox.exceptions import AuthError
+from dropbox.files import DeleteArg
 from pydantic import ValidationError
 from pytest import LogCaptureFixture
 
@@ -42,17 +44,30 @@ def clean_dummies_from_folder(folder_path: str) -> None:
             sys.exit("ERROR: Invalid access token.")
 
         folders_results = dbx.files_list_folder(path=folder_path)
-        entries = folders_results.entries
-        for entry in entries:
-            if "dummy" in entry.name:
-                print("Deleting folder: " + entry.name)
-                full_path = folder_path + entry.name
-
-                print("Deleting folder: " + full_path)
-                try:
-                    dbx.files_delete_v2(path=full_path)
-                except ApiError:
-                    print(f"Failed to delete {full_path}. Most likely already deleted.")
+        full_paths = [
+            folder_path + entry.name
+            for entry in folders_results.entries
+            if "dummy" in entry.name
+        ]
+        if not full_paths:
+            return
+        print("Deleting folders: " + ", ".join(full_paths))
+
+        # all the folders are deleted in a single batch job
+        job = dbx.files_delete_batch([DeleteArg(path=path) for path in full_paths])
+        if job.is_async_job_id():
+            job_status = dbx.files_delete_batch_check(job.get_async_job_id())
+            while job_status.is_in_progress():
+                time.sleep(1)
+                job_status = dbx.files_delete_batch_check(job.get_async_job_id())
+        else:
+            job_status = job
+        if not job_status.is_complete():
+            print("Failed to delete the folders.")
+            return
+        for full_path, entry in zip(full_paths, job_status.get_complete().entries):
+            if entry.is_failure():
+                print(f"Failed to delete {full_path}. Most likely already deleted.")
 
 
 class StorageCoreTestUtils:
@@ -318,6 +333,10 @@ class StorageProviderTestUtils:
         assert len(test_result) >= 2
         # make sure that the .json is not in the file names that are returned
         assert all(".json" not in res_string for res_string in test_result)
+        # the lazy lookup gives the same files
+        assert list(storage_provider.iter_file_queue("test/subcollection")) == (
+            test_result
+        )
 
         # remove the files
         storage_provider.delete("test/subcollection", job_id_1)
@@ -522,7 +541,7 @@ class StorageProviderTestUtils:
         db_name: str,
         sign: bool,
         caplog: LogCaptureFixture,
-    ) -> Tuple[str, Any]:
+    ) -> tuple[str, Any]:
         """
         Test the backend status.
         """
@@ -797,7 +816,7 @@ class StorageProviderTestUtils:
         # clean up
         storage_provider._delete_config(backend_name)
 
-    def job_tests(self, db_name: str, sign: bool = True) -> Tuple[str, str, str, Any]:
+    def job_tests(self, db_name: str, sign: bool = True) -> tuple[str, str, str, Any]:
         """
         Test the job upload and download.
 
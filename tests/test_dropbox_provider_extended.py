@@ -2,19 +2,340 @@
 The tests for the storage provider
 """
 
-from typing import Any
+from types import SimpleNamespace
+from typing import Any, Callable
 
+import dropbox
 import pytest
 from decouple import config
+from dropbox.auth import AuthError as AuthErrorReason
+from dropbox.exceptions import AuthError
+from dropbox.files import (
+    UploadSessionFinishBatchResultEntry,
+    UploadSessionFinishError,
+    WriteConflictError,
+    WriteError,
+)
 from pytest import LogCaptureFixture
 
 from sqooler.schemes import DropboxLoginInformation
+from sqooler.storage_providers import dropbox as dropbox_module
+from sqooler.storage_providers.base import StorageAuthError
 from sqooler.storage_providers.dropbox import DropboxCore, DropboxProviderExtended
 
 from .storage_provider_test_utils import StorageCoreTestUtils, StorageProviderTestUtils
 
 DB_NAME = "dropboxtest"
 
+# sets a stand-in for the dropbox client of a storage provider
+DummyClientSetter = Callable[[DropboxCore, Any], None]
+
+
+# pylint: disable=W0621
+@pytest.fixture
+def set_dummy_client(monkeypatch: pytest.MonkeyPatch) -> DummyClientSetter:
+    """
+    Start the test without any shared dropbox client and give back a function that
+    sets a stand-in for the client of a storage provider.
+    """
+    monkeypatch.setattr(dropbox_module, "_DROPBOX_CLIENTS", {})
+
+    def set_client(storage_provider: DropboxCore, client: Any) -> None:
+        dropbox_module._DROPBOX_CLIENTS[storage_provider._client_key] = client
+
+    return set_client
+
+
+def test_close_client(set_dummy_client: DummyClientSetter) -> None:
+    """
+    Test that the shared client can be closed and is created again afterwards.
+    """
+    login = DropboxLoginInformation(
+        app_key="key", app_secret="secret", refresh_token="token"
+    )
+    storage_provider = DropboxCore(login, name="dropboxtest")
+    # closing without a client does nothing
+    storage_provider.close()
+
+    closed = []
+
+    class DummyClient:
+        """
+        A stand-in for the dropbox client that records that it was closed.
+        """
+
+        def close(self) -> None:
+            """
+            Record the closing.
+            """
+            closed.append(True)
+
+    set_dummy_client(storage_provider, DummyClient())
+    # the client is shared by all the providers with the same login
+    other_provider = DropboxCore(login, name="other")
+    assert other_provider._client() is storage_provider._client()
+
+    other_provider.close()
+    assert closed == [True]
+    assert not dropbox_module._DROPBOX_CLIENTS
+
+
+@pytest.mark.usefixtures("set_dummy_client")
+def test_invalid_refresh_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that an invalid refresh token raises the StorageAuthError.
+    """
+
+    def refuse_refresh(self: Any) -> None:
+        raise AuthError("request_id", AuthErrorReason.invalid_access_token)
+
+    monkeypatch.setattr(
+        dropbox.Dropbox, "check_and_refresh_access_token", refuse_refresh
+    )
+    login = DropboxLoginInformation(
+        app_key="key", app_secret="secret", refresh_token="invalid"
+    )
+    storage_provider = DropboxProviderExtended(login, name="dropboxtest")
+    with pytest.raises(StorageAuthError):
+        next(storage_provider.iter_file_queue("Backend_files/Queued_Jobs/test"))
+    assert not dropbox_module._DROPBOX_CLIENTS
+
+
+def test_queue_page_size(set_dummy_client: DummyClientSetter) -> None:
+    """
+    Test that the queue is listed in pages of the number of jobs the caller needs.
+    """
+    login = DropboxLoginInformation(
+        app_key="key", app_secret="secret", refresh_token="token"
+    )
+    storage_provider = DropboxProviderExtended(login, name="dropboxtest")
+    limits = []
+
+    class DummyClient:
+        """
+        A stand-in for the dropbox client that records the requested page size.
+        """
+
+        def files_list_folder(
+            self, path: str, limit: int  # pylint: disable=unused-argument
+        ) -> Any:
+            """
+            Record the page size and return an empty folder.
+            """
+            limits.append(limit)
+            return SimpleNamespace(entries=[], has_more=False)
+
+    set_dummy_client(storage_provider, DummyClient())
+    queue_path = "Backend_files/Queued_Jobs/test"
+    assert not list(storage_provider.iter_file_queue(queue_path))
+    assert not list(storage_provider.iter_file_queue(queue_path, page_size=5))
+    assert not list(storage_provider.iter_file_queue(queue_path, page_size=5000))
+    assert limits == [storage_provider.queue_page_size, 5, 2000]
+
+
+def test_upload_large(
+    monkeypatch: pytest.MonkeyPatch, set_dummy_client: DummyClientSetter
+) -> None:
+    """
+    Test that large files are uploaded in chunks through a concurrent session.
+    """
+    monkeypatch.setattr(dropbox_module, "_LARGE_UPLOAD_SIZE", 8)
+    monkeypatch.setattr(dropbox_module, "_UPLOAD_CHUNK_SIZE", 4)
+    login = DropboxLoginInformation(
+        app_key="key", app_secret="secret", refresh_token="token"
+    )
+    storage_provider = DropboxCore(login, name="dropboxtest")
+    calls: dict[str, Any] = {"chunks": {}}
+
+    class DummyClient:
+        """
+        A stand-in for the dropbox client that records the upload session.
+        """
+
+        def files_upload_session_start(self, payload: bytes, **kwargs: Any) -> Any:
+            """
+            Record the start of the session.
+            """
+            calls["start"] = (payload, kwargs)
+            return SimpleNamespace(session_id="session")
+
+        def files_upload_session_append_v2(
+            self, payload: bytes, cursor: Any, close: bool
+        ) -> None:
+            """
+            Record the chunks.
+            """
+            calls["chunks"][cursor.offset] = (payload, close)
+
+        def files_upload_session_finish(
+            self, payload: bytes, cursor: Any, commit: Any
+        ) -> None:
+            """
+            Record the commit.
+            """
+            calls["finish"] = (payload, cursor.offset, commit.path)
+
+    set_dummy_client(storage_provider, DummyClient())
+    payload = b"0123456789"
+    storage_provider._upload_bytes(payload, "test/large", "job")
+
+    assert calls["start"][0] == b""
+    assert calls["chunks"] == {
+        0: (b"0123", False),
+        4: (b"4567", False),
+        8: (b"89", True),
+    }
+    assert calls["finish"] == (b"", len(payload), "/test/large/job.json")
+
+
+def test_upload_many_large(
+    monkeypatch: pytest.MonkeyPatch, set_dummy_client: DummyClientSetter
+) -> None:
+    """
+    Test that large files in a batch are sent in chunks before the batch is committed.
+    """
+    monkeypatch.setattr(dropbox_module, "_LARGE_UPLOAD_SIZE", 16)
+    monkeypatch.setattr(dropbox_module, "_UPLOAD_CHUNK_SIZE", 16)
+    login = DropboxLoginInformation(
+        app_key="key", app_secret="secret", refresh_token="token"
+    )
+    storage_provider = DropboxCore(login, name="dropboxtest")
+    calls: dict[str, Any] = {"starts": {}, "chunks": []}
+
+    class DummyClient:
+        """
+        A stand-in for the dropbox client that records the upload sessions.
+        """
+
+        def files_upload_session_start(self, payload: bytes, **kwargs: Any) -> Any:
+            """
+            Record the start of the sessions.
+            """
+            session_id = f"session-{len(payload)}"
+            calls["starts"][session_id] = (payload, kwargs)
+            return SimpleNamespace(session_id=session_id)
+
+        def files_upload_session_append_v2(
+            self, payload: bytes, cursor: Any, close: bool
+        ) -> None:
+            """
+            Record the chunks.
+            """
+            calls["chunks"].append((cursor.session_id, payload, close))
+
+        def files_upload_session_finish_batch_v2(self, entries: list) -> Any:
+            """
+            Record the commit of the batch.
+            """
+            calls["finish"] = [
+                (entry.commit.path, entry.commit.mode.is_add()) for entry in entries
+            ]
+            return SimpleNamespace(
+                entries=[SimpleNamespace(is_failure=lambda: False) for _ in entries]
+            )
+
+    set_dummy_client(storage_provider, DummyClient())
+    storage_provider.upload_many(
+        [({"a": 1}, "test/many", "small"), ({"a": "0123456789"}, "test/many", "large")]
+    )
+
+    # the small file is sent with the start of its session
+    assert calls["starts"]["session-7"] == (b'{"a":1}', {"close": True})
+    # the large one in chunks of a concurrent session
+    assert calls["starts"]["session-0"][0] == b""
+    assert [chunk[2] for chunk in calls["chunks"]] == [False, True]
+    # existing files are not overwritten
+    assert calls["finish"] == [
+        ("/test/many/small.json", True),
+        ("/test/many/large.json", True),
+    ]
+
+
+def test_upload_many_batch_size(
+    monkeypatch: pytest.MonkeyPatch, set_dummy_client: DummyClientSetter
+) -> None:
+    """
+    Test that upload_many commits the files in batches of limited size.
+    """
+    monkeypatch.setattr(dropbox_module, "_MAX_BATCH_SIZE", 2)
+    login = DropboxLoginInformation(
+        app_key="key", app_secret="secret", refresh_token="token"
+    )
+    storage_provider = DropboxCore(login, name="dropboxtest")
+    batches: list[list[str]] = []
+
+    class DummyClient:
+        """
+        A stand-in for the dropbox client that records the committed batches.
+        """
+
+        def files_upload_session_start(  # pylint: disable=unused-argument
+            self, *args: Any, **kwargs: Any
+        ) -> Any:
+            """
+            Start the session.
+            """
+            return SimpleNamespace(session_id="session")
+
+        def files_upload_session_finish_batch_v2(self, entries: list) -> Any:
+            """
+            Record the commit of the batch.
+            """
+            batches.append([entry.commit.path for entry in entries])
+            return SimpleNamespace(
+                entries=[SimpleNamespace(is_failure=lambda: False) for _ in entries]
+            )
+
+    set_dummy_client(storage_provider, DummyClient())
+    storage_provider.upload_many(
+        [({"a": ii}, "test/many", f"file{ii}") for ii in range(5)]
+    )
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [path for batch in batches for path in batch] == [
+        f"/test/many/file{ii}.json" for ii in range(5)
+    ]
+
+
+def test_upload_many_conflict(set_dummy_client: DummyClientSetter) -> None:
+    """
+    Test that upload_many raises a FileExistsError for files that already exist.
+    """
+    login = DropboxLoginInformation(
+        app_key="key", app_secret="secret", refresh_token="token"
+    )
+    storage_provider = DropboxCore(login, name="dropboxtest")
+
+    class DummyClient:
+        """
+        A stand-in for the dropbox client that refuses to overwrite the files.
+        """
+
+        def files_upload_session_start(  # pylint: disable=unused-argument
+            self, *args: Any, **kwargs: Any
+        ) -> Any:
+            """
+            Start the session.
+            """
+            return SimpleNamespace(session_id="session")
+
+        def files_upload_session_finish_batch_v2(self, entries: list) -> Any:
+            """
+            Refuse all the files of the batch.
+            """
+            conflict = UploadSessionFinishError.path(
+                WriteError.conflict(WriteConflictError.file)
+            )
+            return SimpleNamespace(
+                entries=[
+                    UploadSessionFinishBatchResultEntry.failure(conflict)
+                    for _ in entries
+                ]
+            )
+
+    set_dummy_client(storage_provider, DummyClient())
+    with pytest.raises(FileExistsError):
+        storage_provider.upload_many([({"a": 1}, "test/many", "existing")])
+
 
 class TestDropboxCore(StorageCoreTestUtils):
     """
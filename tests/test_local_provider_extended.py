@@ -10,8 +10,9 @@ import pytest
 from decouple import config
 from pytest import LogCaptureFixture
 
-from sqooler.schemes import LocalLoginInformation
+from sqooler.schemes import LocalLoginInformation, get_init_status
 from sqooler.storage_providers.local import LocalCore, LocalProviderExtended
+from sqooler.utils import get_dummy_config
 
 from .storage_provider_test_utils import StorageCoreTestUtils, StorageProviderTestUtils
 
@@ -194,3 +195,108 @@ class TestLocalProviderExtended(StorageProviderTestUtils):
         result_json_dir = "results/" + backend_name
         full_path = os.path.join(storage_provider.base_path, result_json_dir)
         os.rmdir(full_path)
+
+    def test_register_path(self) -> None:
+        """
+        Test that the folders are only resolved once and resolved properly.
+        """
+        storage_provider = LocalProviderExtended(self.get_login(), DB_NAME)
+        queue_path = storage_provider.get_attribute_path("queue", "test")
+        storage_provider.register_backend_paths("test")
+        assert queue_path in storage_provider._resolved_paths
+
+        folder_path = storage_provider._resolve_path(queue_path)
+        assert folder_path == os.path.normpath(
+            os.path.join(storage_provider.base_path, queue_path.strip("/"))
+        )
+        assert storage_provider._resolve_path("/" + queue_path + "/") == folder_path
+
+    def test_claim_taken_job(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Test that a job that was taken by another worker is skipped in the queue.
+        """
+        storage_provider = LocalProviderExtended(self.get_login(), DB_NAME)
+        backend_name, config_info = get_dummy_config(sign=False)
+        storage_provider.upload_config(config_info, display_name=backend_name)
+        job_id = storage_provider.upload_job(
+            job_dict={"experiment_0": {}}, display_name=backend_name, username="test"
+        )
+        original_iter = storage_provider.iter_file_queue
+
+        def iter_with_taken_job(storage_path: str, page_size: int = 1) -> Any:
+            # the first job vanished before we could move it
+            yield "taken"
+            yield from original_iter(storage_path, page_size)
+
+        monkeypatch.setattr(storage_provider, "iter_file_queue", iter_with_taken_job)
+        next_job = storage_provider.get_next_job_in_queue(backend_name)
+        assert next_job.job_id == job_id
+        assert next_job.job_json_path == storage_provider.get_attribute_path("running")
+
+        # clean up
+        storage_provider.delete(
+            storage_provider.get_attribute_path("running"),
+            storage_provider.get_attribute_id("job", job_id),
+        )
+        storage_provider._delete_config(backend_name)
+
+    def test_claim_several_jobs(self) -> None:
+        """
+        Test that several jobs can be claimed from the queue at once.
+        """
+        storage_provider = LocalProviderExtended(self.get_login(), DB_NAME)
+        backend_name, config_info = get_dummy_config(sign=False)
+        storage_provider.upload_config(config_info, display_name=backend_name)
+        job_ids = {
+            storage_provider.upload_job(
+                job_dict={"experiment_0": {}},
+                display_name=backend_name,
+                username="test",
+            )
+            for _ in range(3)
+        }
+        next_jobs = storage_provider.get_next_jobs_in_queue(backend_name, 2)
+        assert len(next_jobs) == 2
+        # the remaining job is claimed and the queue is empty afterwards
+        next_jobs += storage_provider.get_next_jobs_in_queue(backend_name, 2)
+        assert {next_job.job_id for next_job in next_jobs} == job_ids
+        assert not storage_provider.get_next_jobs_in_queue(backend_name, 2)
+
+        # clean up
+        for job_id in job_ids:
+            storage_provider.delete(
+                storage_provider.get_attribute_path("running"),
+                storage_provider.get_attribute_id("job", job_id),
+            )
+        storage_provider._delete_config(backend_name)
+
+    def test_status_without_result(self) -> None:
+        """
+        Test that intermediate status updates do not need a result.
+        """
+        storage_provider = LocalProviderExtended(self.get_login(), DB_NAME)
+        backend_name, config_info = get_dummy_config(sign=False)
+        storage_provider.upload_config(config_info, display_name=backend_name)
+        job_id = storage_provider.upload_job(
+            job_dict={"experiment_0": {}}, display_name=backend_name, username="test"
+        )
+        storage_provider.upload_status(backend_name, "test", job_id)
+
+        job_status = get_init_status()
+        job_status.job_id = job_id
+        job_status.status = "QUEUED"
+        storage_provider.update_in_database(None, job_status, job_id, backend_name)
+        obtained_status = storage_provider.get_status(backend_name, "test", job_id)
+        assert obtained_status.status == "QUEUED"
+
+        job_status.status = "DONE"
+        with pytest.raises(ValueError):
+            storage_provider.update_in_database(None, job_status, job_id, backend_name)
+
+        # clean up
+        storage_provider.delete(
+            storage_provider.get_attribute_path("queue", backend_name),
+            storage_provider.get_attribute_id("job", job_id),
+        )
+        storage_provider._delete_status(backend_name, "test", job_id)
+        storage_provider._delete_config(backend_name)
@@ -5,7 +5,7 @@ In this module we put together tests that are necessary for a smooth migration b
 import shutil
 import uuid
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import Optional
 
 from decouple import config
 from icecream import ic
@@ -62,7 +62,7 @@ class BackendConfigSchemaOld(BaseModel, validate_assignment=True):
     )
 
 
-def get_old_dummy_config(sign: bool = True) -> Tuple[str, BackendConfigSchemaOld]:
+def get_old_dummy_config(sign: bool = True) -> tuple[str, BackendConfigSchemaOld]:
     """
     Generate the dummy config of the fermion type.
 
@@ -4,8 +4,6 @@ The tests for the storage provider using mongodb
 
 from typing import Any
 
-from bson.objectid import ObjectId
-
 # get the environment variables
 from decouple import config
 
@@ -68,49 +66,42 @@ class TestMongodbProvider(StorageProviderTestUtils):
         }
         login_info = MongodbLoginInformation(**login_dict)
 
-        # Remove all the collections that start with queued.
+        # Remove all the collections that start with queued.dummy. The server only
+        # lists the matching names.
         storage_provider = MongodbProvider(login_info)
         database = storage_provider.client["jobs"]
-        for collection_name in database.list_collection_names():
-            if collection_name.startswith("queued.dummy"):
-                collection = database[collection_name]
-                collection.drop()
+        for collection_name in database.list_collection_names(
+            filter={"name": {"$regex": "^queued\\.dummy"}}
+        ):
+            database.drop_collection(collection_name)
 
         # Remove all the collections from results that start with dummy
         database = storage_provider.client["results"]
-        for collection_name in database.list_collection_names():
-            if collection_name.startswith("dummy"):
-                collection = database[collection_name]
-                collection.drop()
+        for collection_name in database.list_collection_names(
+            filter={"name": {"$regex": "^dummy"}}
+        ):
+            database.drop_collection(collection_name)
 
         # Remove all the collections from status that start with dummy
         database = storage_provider.client["status"]
-        for collection_name in database.list_collection_names():
-            if collection_name.startswith("dummy"):
-                collection = database[collection_name]
-                collection.drop()
+        for collection_name in database.list_collection_names(
+            filter={"name": {"$regex": "^dummy"}}
+        ):
+            database.drop_collection(collection_name)
 
         # Remove all the dummy configs
-        database = storage_provider.client["backends"]
-        collection = database["configs"]
-
-        database = storage_provider.client["status"]
-        for config_dict in collection.find():
-            if "display_name" in config_dict:
-                if "dummy" in config_dict["display_name"]:
-                    print("Deleting config: " + config_dict["display_name"])
-                    collection.delete_one({"_id": ObjectId(config_dict["_id"])})
-            if "payload" in config_dict:
-                if "display_name" in config_dict["payload"]:
-                    print(config_dict["payload"])
-                    if "dummy" in config_dict["payload"]["display_name"]:
-                        print(
-                            "Deleting config: " + config_dict["payload"]["display_name"]
-                        )
-                        collection.delete_one({"_id": ObjectId(config_dict["_id"])})
-                else:
-                    print("Deleting config: " + config_dict["display_name"])
-                    collection.delete_one({"_id": ObjectId(config_dict["_id"])})
-            else:
-                print("Deleting random config")
-                collection.delete_one({"_id": ObjectId(config_dict["_id"])})
+        _, collection = storage_provider._get_database_and_collection(
+            storage_provider.configs_path
+        )
+        # the dummy configs and all the configs without a signed display_name are
+        # deleted by the server in one go
+        result = collection.delete_many(
+            {
+                "$or": [
+                    {"display_name": {"$regex": "dummy"}},
+                    {"payload.display_name": {"$exists": False}},
+                    {"payload.display_name": {"$regex": "dummy"}},
+                ]
+            }
+        )
+        print(f"Deleted {result.deleted_count} configs.")
@@ -5,17 +5,34 @@ The tests for the extended mongodb storage provider
 from typing import Any
 
 import pytest
+from bson.errors import InvalidId
+from bson.objectid import ObjectId
 from decouple import config
 from pytest import LogCaptureFixture
 
 from sqooler.schemes import MongodbLoginInformation
-from sqooler.storage_providers.mongodb import MongodbCore, MongodbProviderExtended
+from sqooler.storage_providers.mongodb import (
+    MongodbCore,
+    MongodbProviderExtended,
+    _object_id,
+)
 
 from .storage_provider_test_utils import StorageCoreTestUtils, StorageProviderTestUtils
 
 DB_NAME = "mongodbtest"
 
 
+def test_object_id_cache() -> None:
+    """
+    Test that the ObjectIds are cached, but invalid ids still raise.
+    """
+    job_id = "65d4d5b1a1b2c3d4e5f60718"
+    assert _object_id(job_id) is _object_id(job_id)
+    assert str(_object_id(job_id)) == job_id
+    with pytest.raises(InvalidId):
+        _object_id("not_a_valid_id")
+
+
 class TestMongodbCore(StorageCoreTestUtils):
     """
     The class that contains all the tests for the extended local provider.
@@ -73,6 +90,48 @@ class TestMongodbCore(StorageCoreTestUtils):
         """
         self.update_raise_error_test(DB_NAME)
 
+    def test_upload_many(self) -> None:
+        """
+        Test that several files can be uploaded at once.
+        """
+        storage_provider = MongodbCore(self.get_login(), DB_NAME)
+        storage_path = "test/subcollection"
+        items = [
+            ({"experiment_0": f"Upload {ii}"}, storage_path, str(ObjectId()))
+            for ii in range(3)
+        ]
+        storage_provider.upload_many(items)
+        for content_dict, _, job_id in items:
+            assert storage_provider.get(storage_path, job_id) == content_dict
+
+        # the existing file is reported, but the new ones are uploaded nevertheless,
+        # also in the collections that come after the duplicate
+        new_job_id = str(ObjectId())
+        other_path = "test/subcollection_2"
+        other_job_id = str(ObjectId())
+        with pytest.raises(FileExistsError):
+            storage_provider.upload_many(
+                [
+                    items[0],
+                    ({"experiment_0": "new"}, storage_path, new_job_id),
+                    ({"experiment_0": "other"}, other_path, other_job_id),
+                ]
+            )
+        assert storage_provider.get(storage_path, new_job_id) == {"experiment_0": "new"}
+        assert storage_provider.get(other_path, other_job_id) == {
+            "experiment_0": "other"
+        }
+
+        # clean up
+        for job_id in [*(job_id for _, _, job_id in items), new_job_id]:
+            storage_provider.delete(storage_path, job_id)
+        storage_provider.delete(other_path, other_job_id)
+
+        # an inactive provider does not upload anything
+        storage_provider.is_active = False
+        with pytest.raises(ValueError):
+            storage_provider.upload_many(items)
+
 
 class TestMongodbProviderExtended(StorageProviderTestUtils):
     """
@@ -173,22 +232,23 @@ class TestMongodbProviderExtended(StorageProviderTestUtils):
         """
         backend_name, _, _, storage_provider = self.job_tests(DB_NAME, sign=sign_it)
 
-        # remove the obsolete collection from the storage
-        database = storage_provider.client["jobs"]
-        collection = database[f"queued.{backend_name}"]
-        collection.drop()
-        collection = database[f"finished.{backend_name}"]
-        collection.drop()
-
-        # remove the obsolete collection from the storage
-        database = storage_provider.client["status"]
-        collection = database[backend_name]
-        collection.drop()
-
-        # remove the obsolete collection from the storage
-        database = storage_provider.client["results"]
-        collection = database[backend_name]
-        collection.drop()
+        # remove the obsolete collections from the storage
+        for attribute_name in ("queue", "finished", "status", "results"):
+            _, collection = storage_provider._get_database_and_collection(
+                storage_provider.get_attribute_path(attribute_name, backend_name)
+            )
+            collection.drop()
+
+    def test_register_paths(self) -> None:
+        """
+        Test that the collections of a backend are cached once they are registered.
+        """
+        storage_provider = MongodbProviderExtended(self.get_login(), DB_NAME)
+        storage_provider.register_backend_paths("test")
+        queue_path = storage_provider.get_attribute_path("queue", "test")
+        assert queue_path in storage_provider._collections
+        _, collection = storage_provider._get_database_and_collection(queue_path)
+        assert collection.full_name == "jobs.queued.test"
 
     def test_file_queue(self) -> None:
         """
@@ -8,8 +8,11 @@ from pydantic import ValidationError
 from sqooler.schemes import (
     BackendConfigSchemaIn,
     ResultDict,
+    StatusMsgDict,
     get_init_results,
     get_init_status,
+    validate_result,
+    validate_status,
 )
 
 
@@ -140,3 +143,19 @@ def test_get_init_results() -> None:
     """
     results = get_init_results()
     assert results.status == "INITIALIZING"
+
+
+def test_validate_status_and_result() -> None:
+    """
+    Test that the cached validators return the models and raise on bad input.
+    """
+    status = validate_status(get_init_status().model_dump())
+    assert isinstance(status, StatusMsgDict)
+    assert status == get_init_status()
+
+    result = validate_result(get_init_results().model_dump())
+    assert isinstance(result, ResultDict)
+    assert result.status == "INITIALIZING"
+
+    with pytest.raises(ValidationError):
+        validate_status({"job_id": "1", "status": "UNKNOWN"})
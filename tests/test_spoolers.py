@@ -5,14 +5,14 @@ Here we test the spooler class and its functions.
 import logging
 import os
 import shutil
-from typing import Callable, Iterator, Literal, Optional
+from typing import Any, Callable, Iterator, Literal, Optional
 
 import pytest
 from pydantic import BaseModel, Field, ValidationError
 from pytest import LogCaptureFixture
 from typing_extensions import Annotated
 
-from sqooler.schemes import LabscriptParams
+from sqooler.schemes import GateInstruction, LabscriptParams
 from sqooler.spoolers import (
     LabscriptSpooler,
     Spooler,
@@ -20,7 +20,11 @@ from sqooler.spoolers import (
     gate_dict_from_list,
 )
 
-from .sqooler_test_utils import DummyInstruction, dummy_gen_circuit
+from .sqooler_test_utils import (
+    DummyFullInstruction,
+    DummyInstruction,
+    dummy_gen_circuit,
+)
 
 
 class DummyExperiment(BaseModel):
@@ -200,6 +204,40 @@ def test_spooler_add_job_fail(
     assert "Error in json compatibility test." in caplog.text
 
 
+def test_spooler_set_gen_circuit() -> None:
+    """
+    Test that the gen_circuit function can be set and is checked once.
+    """
+    test_spooler = Spooler(
+        ins_schema_dict={"test": DummyInstruction},
+        device_config=DummyExperiment,
+        n_wires=2,
+    )
+    with pytest.raises(ValueError, match="gen_circuit must be a callable function"):
+        test_spooler.set_gen_circuit("not callable")  # type: ignore[arg-type]
+
+    test_spooler.set_gen_circuit(dummy_gen_circuit)
+    assert test_spooler.gen_circuit is dummy_gen_circuit
+
+
+def test_spooler_configure() -> None:
+    """
+    Test that the spooler can be configured in one go.
+    """
+    test_spooler = Spooler(
+        ins_schema_dict={"test": DummyInstruction},
+        device_config=DummyExperiment,
+        n_wires=2,
+    )
+    assert test_spooler.display_name == ""
+    with pytest.raises(ValueError, match="display_name must be a string"):
+        test_spooler.configure(display_name=1)  # type: ignore[arg-type]
+
+    test_spooler.configure(display_name="dummy", gen_circuit=dummy_gen_circuit)
+    assert test_spooler.display_name == "dummy"
+    assert test_spooler.gen_circuit is dummy_gen_circuit
+
+
 def test_spooler_add_job(
     caplog: LogCaptureFixture,
 ) -> None:
@@ -283,6 +321,33 @@ def test_gate_dict() -> None:
         gate_dict_from_list(inst_list)
 
 
+def test_gate_config_dict() -> None:
+    """
+    Test that the config dict of the instructions is built once per class and
+    that every caller gets its own copy.
+    """
+    config_dict = DummyFullInstruction.config_dict()
+    assert config_dict["name"] == "test"
+    assert config_dict["parameters"] == ["omega, delta, phi"]
+    assert DummyFullInstruction.config_dict() == config_dict
+
+    # changes of the callers do not leak into the cache
+    config_dict["name"] = "changed"
+    config_dict["parameters"].append("theta")
+    config_dict["coupling_map"][0].append(5)
+    assert DummyFullInstruction.config_dict()["name"] == "test"
+    assert DummyFullInstruction.config_dict()["parameters"] == ["omega, delta, phi"]
+    assert DummyFullInstruction.config_dict()["coupling_map"][0] == [0]
+
+    # the classes do not share their cache
+    assert DummyInstruction.config_dict()["coupling_map"] == [
+        [0],
+        [1],
+        [2],
+        [0, 1, 2, 3, 4],
+    ]
+
+
 def test_spooler_check_json() -> None:
     """
     Test that it is possible to verify the validity of the json.
@@ -334,6 +399,67 @@ def test_spooler_check_json() -> None:
     assert exp_ok is not True
 
 
+@pytest.mark.parametrize(
+    "exp_name, expected_err",
+    [
+        ("exp_0", "Experiment name must start with experiment_"),
+        ("experiment_", "Experiment name must end with a number"),
+        ("experiment_²", "Experiment name must end with a number"),
+        ("experiment_1a", "Experiment name must end with a number"),
+        ("experiment_16", "Experiment number too high. Must be less than 15"),
+    ],
+)
+def test_spooler_check_json_names(exp_name: str, expected_err: str) -> None:
+    """
+    Test that the names of the experiments are checked properly.
+    """
+    test_spooler = Spooler(
+        ins_schema_dict={"test": DummyInstruction},
+        device_config=DummyExperiment,
+        n_wires=2,
+    )
+    job_payload = {
+        exp_name: {
+            "instructions": [["test", [0], [2]]],
+            "num_wires": 2,
+            "shots": 4,
+            "wire_order": "interleaved",
+        },
+    }
+    err_code, exp_ok, _ = test_spooler.check_json_dict(job_payload)
+    assert exp_ok is False
+    assert err_code == expected_err
+
+
+def test_spooler_json_n_max() -> None:
+    """
+    Test that the allowed names of the experiments follow `n_max_experiments`.
+    """
+    test_spooler = Spooler(
+        ins_schema_dict={"test": DummyInstruction},
+        device_config=DummyExperiment,
+        n_wires=2,
+        n_max_experiments=2,
+    )
+    exp_data = {
+        "instructions": [["test", [0], [2]]],
+        "num_wires": 2,
+        "shots": 4,
+        "wire_order": "interleaved",
+    }
+    # names that only pass the parsing are still fine
+    _, exp_ok, clean_dict = test_spooler.check_json_dict({"experiment_01": exp_data})
+    assert exp_ok is True
+    assert "experiment_01" in clean_dict
+
+    _, exp_ok, _ = test_spooler.check_json_dict({"experiment_3": exp_data})
+    assert exp_ok is False
+
+    test_spooler.n_max_experiments = 3
+    _, exp_ok, _ = test_spooler.check_json_dict({"experiment_3": exp_data})
+    assert exp_ok is True
+
+
 def test_spooler_instructions() -> None:
     """
     Test that it is possible to verify the validity of the instructions.
@@ -374,6 +500,150 @@ def test_spooler_instructions() -> None:
     err_code, exp_ok = test_spooler.check_instructions(inst_list)
     assert exp_ok is True
 
+    # unknown or unhashable names give an error code instead of an exception
+    for inst in (["load", [0], [1]], [["test"], [0], [1]]):
+        err_code, exp_ok = test_spooler.check_instructions([inst])
+        assert exp_ok is False
+        assert err_code == f"Instruction {inst[0]} not allowed."
+
+    # test that malformed instructions are rejected before the validation
+    malformed_insts: list[Any] = [["test", [0]], "test", ["test", [0], [1], []]]
+    for malformed_inst in malformed_insts:
+        err_code, exp_ok = test_spooler.check_instructions([malformed_inst])
+        assert exp_ok is False
+        assert "must be of the form [name, wires, params]" in err_code
+
+
+class DummyLoadInstruction(GateInstruction):
+    """
+    A second instruction to test spoolers with several instructions.
+    """
+
+    name: Literal["load"] = "load"
+    wires: Annotated[
+        list[Annotated[int, Field(ge=0, le=1)]], Field(min_length=1, max_length=1)
+    ]
+    params: Annotated[list[float], Field(min_length=0, max_length=0)]
+    parameters: str = ""
+    description: str = "Load an atom."
+    coupling_map: list = [[0], [1]]
+
+
+@pytest.mark.parametrize("name_fixed", [True, False])
+def test_spooler_multi_instructions(name_fixed: bool) -> None:
+    """
+    Test that a list of different instructions is validated properly, both if the
+    instructions can be told apart by their name and if not.
+    """
+
+    class DummyUnfixedInstruction(GateInstruction):
+        """
+        An instruction without a fixed name.
+        """
+
+        name: str = "load"
+        wires: Annotated[
+            list[Annotated[int, Field(ge=0, le=1)]], Field(min_length=1, max_length=1)
+        ]
+        params: Annotated[list[float], Field(min_length=0, max_length=0)]
+        parameters: str = ""
+        description: str = "Load an atom."
+        coupling_map: list = [[0], [1]]
+
+    load_instruction = DummyLoadInstruction if name_fixed else DummyUnfixedInstruction
+    test_spooler = Spooler(
+        ins_schema_dict={"test": DummyInstruction, "load": load_instruction},
+        device_config=DummyExperiment,
+        n_wires=2,
+    )
+    assert (test_spooler._ins_adapter is not None) == name_fixed
+
+    inst_list = [["load", [1], []], ["test", [0], [1]], ["load", [0], []]]
+    err_code, exp_ok = test_spooler.check_instructions(inst_list)
+    assert exp_ok is True
+    assert err_code == ""
+
+    inst_list = [["load", [1], []], ["load", [2], []]]
+    err_code, exp_ok = test_spooler.check_instructions(inst_list)
+    assert exp_ok is False
+    # the message only reports the invalid instruction, no matter how it was validated
+    assert err_code.startswith(
+        f"Error in instruction 1 validation error for {load_instruction.__name__}\n"
+        "wires.0\n"
+    )
+
+
+def test_spooler_ins_schema_dict() -> None:
+    """
+    Test that the checks and the configuration follow newly assigned instructions.
+    """
+    test_spooler = Spooler(
+        ins_schema_dict={"test": DummyInstruction},
+        device_config=DummyExperiment,
+        n_wires=2,
+    )
+    test_spooler.ins_schema_dict = {"test": DummyFullInstruction}
+    err_code, exp_ok = test_spooler.check_instructions(
+        [["test", [0, 1, 2, 3, 4], [1, 1, 1]]]
+    )
+    assert exp_ok is True, err_code
+    assert test_spooler.get_configuration().gates[0]["coupling_map"] == (
+        DummyFullInstruction.config_dict()["coupling_map"]
+    )
+
+
+def test_spooler_trusted() -> None:
+    """
+    Test that a trusted spooler skips the validation but still checks the names.
+    """
+    test_spooler = Spooler(
+        ins_schema_dict={"test": DummyInstruction},
+        device_config=DummyExperiment,
+        n_wires=2,
+        trusted=True,
+    )
+
+    # the wire is out of range, but the validation is skipped
+    inst_list = [["test", [3], [1]]]
+    err_code, exp_ok = test_spooler.check_instructions(inst_list)
+    assert exp_ok is True
+    assert err_code == ""
+
+    inst_list = [["load", [0], [1]]]
+    err_code, exp_ok = test_spooler.check_instructions(inst_list)
+    assert exp_ok is False
+    assert err_code == "Instruction load not allowed."
+
+    # the shape of the instructions is still checked
+    err_code, exp_ok = test_spooler.check_instructions([["test", [0]]])
+    assert exp_ok is False
+    assert (
+        err_code
+        == "Instruction ['test', [0]] must be of the form [name, wires, params]."
+    )
+
+    # malformed wires are caught when the instructions are converted
+    job_payload = {
+        "experiment_0": {
+            "instructions": [["test", "x", [1]]],
+            "num_wires": 1,
+            "shots": 3,
+            "wire_order": "interleaved",
+        },
+    }
+    err_code, exp_ok, _ = test_spooler.check_json_dict(job_payload)
+    assert exp_ok is False
+    assert err_code.startswith("Error in instruction ")
+
+    # the untrusted spooler catches the invalid wire
+    test_spooler.trusted = False
+    inst_list = [["test", [3], [1]]]
+    err_code, exp_ok = test_spooler.check_instructions(inst_list)
+    assert exp_ok is False
+    assert err_code.startswith(
+        "Error in instruction 1 validation error for DummyInstruction\nwires.0\n"
+    )
+
 
 def test_wire_orders() -> None:
     """
@@ -565,6 +835,25 @@ def test_labscript_spooler_add_job(
     assert status_msg_dict.status == "DONE", "Job should not have failed"
 
 
+class ArrayLike:
+    """
+    A minimal stand-in for arrays like the ones of numpy, which cannot be formatted
+    row by row.
+    """
+
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+
+    def __iter__(self) -> Iterator:
+        raise AssertionError("The rows should not be iterated one by one.")
+
+    def tolist(self) -> list:
+        """
+        Give back the content as nested lists.
+        """
+        return self.rows
+
+
 def test_create_memory_data() -> None:
     """
     Test that it is possible to create the memory data.
@@ -574,6 +863,16 @@ def test_create_memory_data() -> None:
     n_shots = 3
     exp_dict = create_memory_data(shots_array, exp_name, n_shots)
     assert exp_dict.success is True
+    assert exp_dict.data.memory == ["1", "2", "3"]
+
+    # the brackets and commas of the shots are removed
+    exp_dict = create_memory_data([[1, 0, 1], [0, 0, 1]], exp_name, 2)
+    assert exp_dict.data.memory == ["1 0 1", "0 0 1"]
+
+    # arrays are converted as a whole before they are formatted
+    array_like = ArrayLike([[1, 0, 1], [0, 0, 1]])
+    exp_dict = create_memory_data(array_like, exp_name, 2)
+    assert exp_dict.data.memory == ["1 0 1", "0 0 1"]
 
     # test with measured wires
     instr = ["test", [0], [1.0]]
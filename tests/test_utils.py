@@ -7,7 +7,7 @@ import os
 import shutil
 import time
 import uuid
-from typing import Callable, Iterator, Literal, Optional
+from typing import Any, Callable, Iterator, Literal, Optional
 
 import pytest
 from decouple import config
@@ -18,6 +18,7 @@ from typing_extensions import Annotated
 from sqooler.schemes import LocalLoginInformation
 from sqooler.security import jwk_from_config_str
 from sqooler.spoolers import Spooler
+from sqooler.storage_providers.base import StorageAuthError
 from sqooler.storage_providers.local import LocalProvider
 from sqooler.utils import get_dummy_config, main, run_json_circuit, update_backends
 
@@ -171,6 +172,24 @@ def test_main(
     assert "Looking for jobs" in caplog.text
 
 
+def test_main_auth_error(
+    caplog: LogCaptureFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test that the main function keeps running if the storage cannot authenticate.
+    """
+    backend_name = "test"
+    test_spooler = Spooler(ins_schema_dict={}, device_config=DummyExperiment, n_wires=2)
+    backends = {backend_name: test_spooler}
+
+    def fail_auth(*args: Any) -> None:
+        raise StorageAuthError("Invalid access token.")
+
+    monkeypatch.setattr(storage_provider, "get_next_job_in_queue", fail_auth)
+    main(storage_provider, backends, num_iter=2)
+    assert "Could not authenticate with the storage." in caplog.text
+
+
 @pytest.mark.parametrize("sign_it", [True, False])
 def test_main_delay(
     sign_it: bool, caplog: LogCaptureFixture, utils_storage_setup_teardown: Callable